@@ -2,11 +2,15 @@
 from .cost_estimator import (
     CostEstimate,
     estimate_costs,
+    estimate_costs_batch,
     TOKEN_PRICING,
+    TOKEN_PRICING_DICT,
 )
 
 __all__ = [
     "CostEstimate",
     "estimate_costs",
+    "estimate_costs_batch",
     "TOKEN_PRICING",
+    "TOKEN_PRICING_DICT",
 ]
@@ -10,9 +10,15 @@ Rules:
 - Clearly marked as non-guaranteed
 - All estimates are informational only
 """
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from dataclasses import dataclass, field
 from datetime import datetime
+from types import MappingProxyType
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 
 @dataclass
@@ -28,14 +34,14 @@ class CostEstimate:
     tokens_per_rag_query: int = 0
     tokens_per_embedding: int = 0
     
-    # Cost estimates (USD)
-    estimated_cost_per_chat_request_usd: float = 0.0
-    estimated_cost_per_rag_query_usd: float = 0.0
-    estimated_cost_per_embedding_usd: float = 0.0
+    # Cost estimates (integer micro-USD, 1e-6 USD; exact, no float drift)
+    cost_per_chat_request_microusd: int = 0
+    cost_per_rag_query_microusd: int = 0
+    cost_per_embedding_microusd: int = 0
     
-    # Monthly projections (based on assumed usage)
-    monthly_estimate_low_usd: float = 0.0
-    monthly_estimate_high_usd: float = 0.0
+    # Monthly projections in micro-USD (based on assumed usage)
+    monthly_estimate_low_microusd: int = 0
+    monthly_estimate_high_microusd: int = 0
     assumed_requests_per_day_low: int = 100
     assumed_requests_per_day_high: int = 10000
     
@@ -52,8 +58,33 @@ class CostEstimate:
         "billing or financial planning without verification from your LLM provider."
     )
     
+    @property
+    def estimated_cost_per_chat_request_usd(self) -> float:
+        return self.cost_per_chat_request_microusd / MICRO_USD_PER_USD
+    
+    @property
+    def estimated_cost_per_rag_query_usd(self) -> float:
+        return self.cost_per_rag_query_microusd / MICRO_USD_PER_USD
+    
+    @property
+    def estimated_cost_per_embedding_usd(self) -> float:
+        return self.cost_per_embedding_microusd / MICRO_USD_PER_USD
+    
+    @property
+    def monthly_estimate_low_usd(self) -> float:
+        return self.monthly_estimate_low_microusd / MICRO_USD_PER_USD
+    
+    @property
+    def monthly_estimate_high_usd(self) -> float:
+        return self.monthly_estimate_high_microusd / MICRO_USD_PER_USD
+    
     def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary for API response"""
+        """
+        Convert to dictionary for API response.
+        
+        Costs are converted from micro-USD to USD only here, at the display
+        step; rounding is left to the client.
+        """
         return {
             "tokens": {
                 "per_chat_request": self.tokens_per_chat_request,
@@ -61,13 +92,13 @@ class CostEstimate:
                 "per_embedding": self.tokens_per_embedding,
             },
             "costs_usd": {
-                "per_chat_request": round(self.estimated_cost_per_chat_request_usd, 6),
-                "per_rag_query": round(self.estimated_cost_per_rag_query_usd, 6),
-                "per_embedding": round(self.estimated_cost_per_embedding_usd, 6),
+                "per_chat_request": self.estimated_cost_per_chat_request_usd,
+                "per_rag_query": self.estimated_cost_per_rag_query_usd,
+                "per_embedding": self.estimated_cost_per_embedding_usd,
             },
             "monthly_projection_usd": {
-                "low": round(self.monthly_estimate_low_usd, 2),
-                "high": round(self.monthly_estimate_high_usd, 2),
+                "low": self.monthly_estimate_low_usd,
+                "high": self.monthly_estimate_high_usd,
                 "assumptions": {
                     "requests_per_day_low": self.assumed_requests_per_day_low,
                     "requests_per_day_high": self.assumed_requests_per_day_high,
@@ -86,38 +117,23 @@ class CostEstimate:
 # Token Pricing (Informational, may be outdated)
 # =============================================================================
 
-TOKEN_PRICING = {
-    # OpenAI pricing as of late 2024 (per 1K tokens)
+TOKEN_PRICING = MappingProxyType({
+    # OpenAI pricing as of late 2024: (input, output) per 1K tokens
     # IMPORTANT: These prices may be outdated. Check OpenAI pricing page.
-    "gpt-4o": {
-        "input": 0.005,      # $5.00 per 1M input tokens
-        "output": 0.015,     # $15.00 per 1M output tokens
-    },
-    "gpt-4o-mini": {
-        "input": 0.00015,    # $0.15 per 1M input tokens
-        "output": 0.0006,    # $0.60 per 1M output tokens
-    },
-    "gpt-4-turbo": {
-        "input": 0.01,       # $10.00 per 1M input tokens
-        "output": 0.03,      # $30.00 per 1M output tokens
-    },
-    "gpt-3.5-turbo": {
-        "input": 0.0005,     # $0.50 per 1M input tokens
-        "output": 0.0015,    # $1.50 per 1M output tokens
-    },
+    "gpt-4o": (0.005, 0.015),              # $5.00 / $15.00 per 1M tokens
+    "gpt-4o-mini": (0.00015, 0.0006),      # $0.15 / $0.60 per 1M tokens
+    "gpt-4-turbo": (0.01, 0.03),           # $10.00 / $30.00 per 1M tokens
+    "gpt-3.5-turbo": (0.0005, 0.0015),     # $0.50 / $1.50 per 1M tokens
     # Embedding models
-    "text-embedding-3-small": {
-        "input": 0.00002,    # $0.02 per 1M tokens
-        "output": 0.0,
-    },
-    "text-embedding-3-large": {
-        "input": 0.00013,    # $0.13 per 1M tokens
-        "output": 0.0,
-    },
-    "text-embedding-ada-002": {
-        "input": 0.0001,     # $0.10 per 1M tokens
-        "output": 0.0,
-    },
+    "text-embedding-3-small": (0.00002, 0.0),  # $0.02 per 1M tokens
+    "text-embedding-3-large": (0.00013, 0.0),  # $0.13 per 1M tokens
+    "text-embedding-ada-002": (0.0001, 0.0),   # $0.10 per 1M tokens
+})
+
+# Labeled form of TOKEN_PRICING for API responses
+TOKEN_PRICING_DICT = {
+    model: {"input": input_price, "output": output_price}
+    for model, (input_price, output_price) in TOKEN_PRICING.items()
 }
 
 # Default token estimates for different operation types
@@ -136,6 +152,42 @@ DEFAULT_TOKEN_ESTIMATES = {
     },
 }
 
+# Usage assumptions for monthly projections
+REQUESTS_PER_DAY_LOW = 100
+REQUESTS_PER_DAY_HIGH = 10000
+DAYS_PER_MONTH = 30
+EMBEDDINGS_PER_REQUEST = 10
+
+
+MICRO_USD_PER_USD = 1_000_000
+
+
+def _operation_cost_microusd(operation: str, input_price: float, output_price: float) -> int:
+    """Cost of one operation at the default token estimates, in micro-USD"""
+    tokens = DEFAULT_TOKEN_ESTIMATES[operation]
+    # Prices are per 1K tokens: tokens / 1000 * price * 1e6 == tokens * price * 1000
+    return round(
+        tokens["input_tokens"] * input_price * 1000
+        + tokens["output_tokens"] * output_price * 1000
+    )
+
+
+# Per-model operation costs in micro-USD, precomputed from the tables above
+CHAT_COST_PER_REQ_MICROUSD = {
+    model: _operation_cost_microusd("chat", *prices) for model, prices in TOKEN_PRICING.items()
+}
+RAG_COST_PER_QUERY_MICROUSD = {
+    model: _operation_cost_microusd("rag", *prices) for model, prices in TOKEN_PRICING.items()
+}
+EMBED_COST_MICROUSD = {
+    model: _operation_cost_microusd("embedding", *prices) for model, prices in TOKEN_PRICING.items()
+}
+
+# Total tokens per operation
+TOKENS_PER_CHAT_REQUEST = sum(DEFAULT_TOKEN_ESTIMATES["chat"].values())
+TOKENS_PER_RAG_QUERY = sum(DEFAULT_TOKEN_ESTIMATES["rag"].values())
+TOKENS_PER_EMBEDDING = DEFAULT_TOKEN_ESTIMATES["embedding"]["input_tokens"]
+
 
 def estimate_costs(cps_data: Dict[str, Any]) -> CostEstimate:
     """
@@ -154,71 +206,124 @@ def estimate_costs(cps_data: Dict[str, Any]) -> CostEstimate:
     model = cps_data.get("model") or "gpt-4o"
     embedding_model = cps_data.get("embedding_model") or "text-embedding-3-small"
     
-    # Get pricing (fallback to gpt-4o if model not found)
-    model_pricing = TOKEN_PRICING.get(model, TOKEN_PRICING.get("gpt-4o"))
-    embedding_pricing = TOKEN_PRICING.get(
-        embedding_model, TOKEN_PRICING.get("text-embedding-3-small")
-    )
-    
     estimate = CostEstimate(
         model_used=model,
         embedding_model_used=embedding_model,
     )
     
-    # Calculate chat costs
+    # Per-operation costs (fallback to gpt-4o / text-embedding-3-small pricing
+    # if the model is not found)
     if features.get("chat"):
-        chat_estimates = DEFAULT_TOKEN_ESTIMATES["chat"]
-        estimate.tokens_per_chat_request = (
-            chat_estimates["input_tokens"] + chat_estimates["output_tokens"]
+        estimate.tokens_per_chat_request = TOKENS_PER_CHAT_REQUEST
+        estimate.cost_per_chat_request_microusd = CHAT_COST_PER_REQ_MICROUSD.get(
+            model, CHAT_COST_PER_REQ_MICROUSD["gpt-4o"]
         )
-        
-        input_cost = (chat_estimates["input_tokens"] / 1000) * model_pricing["input"]
-        output_cost = (chat_estimates["output_tokens"] / 1000) * model_pricing["output"]
-        estimate.estimated_cost_per_chat_request_usd = input_cost + output_cost
     
-    # Calculate RAG costs
     if features.get("rag"):
-        rag_estimates = DEFAULT_TOKEN_ESTIMATES["rag"]
-        estimate.tokens_per_rag_query = (
-            rag_estimates["input_tokens"] + rag_estimates["output_tokens"]
+        estimate.tokens_per_rag_query = TOKENS_PER_RAG_QUERY
+        estimate.cost_per_rag_query_microusd = RAG_COST_PER_QUERY_MICROUSD.get(
+            model, RAG_COST_PER_QUERY_MICROUSD["gpt-4o"]
         )
-        
-        input_cost = (rag_estimates["input_tokens"] / 1000) * model_pricing["input"]
-        output_cost = (rag_estimates["output_tokens"] / 1000) * model_pricing["output"]
-        estimate.estimated_cost_per_rag_query_usd = input_cost + output_cost
     
-    # Calculate embedding costs
     if features.get("embeddings"):
-        embed_estimates = DEFAULT_TOKEN_ESTIMATES["embedding"]
-        estimate.tokens_per_embedding = embed_estimates["input_tokens"]
-        
-        estimate.estimated_cost_per_embedding_usd = (
-            (embed_estimates["input_tokens"] / 1000) * embedding_pricing["input"]
+        estimate.tokens_per_embedding = TOKENS_PER_EMBEDDING
+        estimate.cost_per_embedding_microusd = EMBED_COST_MICROUSD.get(
+            embedding_model, EMBED_COST_MICROUSD["text-embedding-3-small"]
         )
     
     # Calculate monthly projections
-    # Assumptions for low/high usage scenarios
-    requests_per_day_low = 100
-    requests_per_day_high = 10000
-    days_per_month = 30
-    
-    daily_cost = 0.0
-    if features.get("chat"):
-        daily_cost += estimate.estimated_cost_per_chat_request_usd
-    if features.get("rag"):
-        daily_cost += estimate.estimated_cost_per_rag_query_usd
-    if features.get("embeddings"):
-        # Assume 10 embeddings per request
-        daily_cost += estimate.estimated_cost_per_embedding_usd * 10
+    daily_cost = (
+        estimate.cost_per_chat_request_microusd
+        + estimate.cost_per_rag_query_microusd
+        + estimate.cost_per_embedding_microusd * EMBEDDINGS_PER_REQUEST
+    )
     
-    estimate.monthly_estimate_low_usd = daily_cost * requests_per_day_low * days_per_month
-    estimate.monthly_estimate_high_usd = daily_cost * requests_per_day_high * days_per_month
-    estimate.assumed_requests_per_day_low = requests_per_day_low
-    estimate.assumed_requests_per_day_high = requests_per_day_high
+    estimate.monthly_estimate_low_microusd = daily_cost * REQUESTS_PER_DAY_LOW * DAYS_PER_MONTH
+    estimate.monthly_estimate_high_microusd = daily_cost * REQUESTS_PER_DAY_HIGH * DAYS_PER_MONTH
+    estimate.assumed_requests_per_day_low = REQUESTS_PER_DAY_LOW
+    estimate.assumed_requests_per_day_high = REQUESTS_PER_DAY_HIGH
     
     return estimate
 
 
+def estimate_costs_batch(cps_list: List[Dict[str, Any]]) -> List[CostEstimate]:
+    """
+    Estimate costs for many CPS configurations at once.
+    
+    Same results as calling estimate_costs() per CPS, but the arithmetic
+    runs as NumPy vector operations across the whole batch. Falls back to
+    per-CPS estimation when NumPy is not installed.
+    
+    Args:
+        cps_list: CPS models as dictionaries
+        
+    Returns:
+        List of CostEstimate, in input order
+    """
+    if np is None or not cps_list:
+        return [estimate_costs(cps_data) for cps_data in cps_list]
+    
+    n = len(cps_list)
+    features = [cps_data.get("features", {}) for cps_data in cps_list]
+    models = [cps_data.get("model") or "gpt-4o" for cps_data in cps_list]
+    embedding_models = [
+        cps_data.get("embedding_model") or "text-embedding-3-small" for cps_data in cps_list
+    ]
+    
+    chat_on = np.fromiter((bool(f.get("chat")) for f in features), dtype=bool, count=n)
+    rag_on = np.fromiter((bool(f.get("rag")) for f in features), dtype=bool, count=n)
+    embed_on = np.fromiter((bool(f.get("embeddings")) for f in features), dtype=bool, count=n)
+    
+    chat_cost = chat_on * np.fromiter(
+        (CHAT_COST_PER_REQ_MICROUSD.get(m, CHAT_COST_PER_REQ_MICROUSD["gpt-4o"]) for m in models),
+        dtype=np.int64,
+        count=n,
+    )
+    rag_cost = rag_on * np.fromiter(
+        (RAG_COST_PER_QUERY_MICROUSD.get(m, RAG_COST_PER_QUERY_MICROUSD["gpt-4o"]) for m in models),
+        dtype=np.int64,
+        count=n,
+    )
+    embed_cost = embed_on * np.fromiter(
+        (EMBED_COST_MICROUSD.get(m, EMBED_COST_MICROUSD["text-embedding-3-small"]) for m in embedding_models),
+        dtype=np.int64,
+        count=n,
+    )
+    
+    daily_cost = chat_cost + rag_cost + embed_cost * EMBEDDINGS_PER_REQUEST
+    monthly_low = daily_cost * REQUESTS_PER_DAY_LOW * DAYS_PER_MONTH
+    monthly_high = daily_cost * REQUESTS_PER_DAY_HIGH * DAYS_PER_MONTH
+    
+    chat_tokens = chat_on * TOKENS_PER_CHAT_REQUEST
+    rag_tokens = rag_on * TOKENS_PER_RAG_QUERY
+    embed_tokens = embed_on * TOKENS_PER_EMBEDDING
+    
+    pricing_date = datetime.now().strftime("%Y-%m-%d")
+    return [
+        CostEstimate(
+            tokens_per_chat_request=ct,
+            tokens_per_rag_query=rt,
+            tokens_per_embedding=et,
+            cost_per_chat_request_microusd=cc,
+            cost_per_rag_query_microusd=rc,
+            cost_per_embedding_microusd=ec,
+            monthly_estimate_low_microusd=lo,
+            monthly_estimate_high_microusd=hi,
+            assumed_requests_per_day_low=REQUESTS_PER_DAY_LOW,
+            assumed_requests_per_day_high=REQUESTS_PER_DAY_HIGH,
+            model_used=m,
+            embedding_model_used=em,
+            pricing_date=pricing_date,
+        )
+        for ct, rt, et, cc, rc, ec, lo, hi, m, em in zip(
+            chat_tokens.tolist(), rag_tokens.tolist(), embed_tokens.tolist(),
+            chat_cost.tolist(), rag_cost.tolist(), embed_cost.tolist(),
+            monthly_low.tolist(), monthly_high.tolist(),
+            models, embedding_models,
+        )
+    ]
+
+
 def get_pricing_info() -> Dict[str, Any]:
     """
     Get current token pricing information.
@@ -227,7 +332,7 @@ def get_pricing_info() -> Dict[str, Any]:
         Dictionary with pricing info and disclaimer
     """
     return {
-        "pricing": TOKEN_PRICING,
+        "pricing": TOKEN_PRICING_DICT,
         "disclaimer": (
             "These prices are informational only and may be outdated. "
             "Check your LLM provider's pricing page for current rates."
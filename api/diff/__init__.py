@@ -3,10 +3,12 @@ from .diff_engine import (
     FileDiff,
     DiffResult,
     compute_diff,
+    pairwise_similarity,
 )
 
 __all__ = [
     "FileDiff",
     "DiffResult",
     "compute_diff",
+    "pairwise_similarity",
 ]
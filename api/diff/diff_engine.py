@@ -9,11 +9,43 @@ Rules:
 - Unchanged files are preserved
 - All comparisons are explicit
 """
-from typing import Dict, List, Optional
-from dataclasses import dataclass
+import hashlib
+import os
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+from dataclasses import dataclass, field
 from enum import Enum
 from difflib import unified_diff, SequenceMatcher
 
+# Native diff backends (optional). Both release the GIL and run in C/Rust;
+# the pure-Python difflib implementations are used when they are missing.
+try:
+    from rapidfuzz.distance import Indel
+except ImportError:
+    Indel = None
+
+try:
+    import numpy
+    from rapidfuzz.process import cdist
+except ImportError:
+    cdist = None
+
+try:
+    import pygit2
+except ImportError:
+    pygit2 = None
+
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+
+# Below this similarity a modified file is treated as a rewrite and the
+# exact ratio is not computed
+SIMILARITY_THRESHOLD = 0.3
+
 
 class FileStatus(Enum):
     """Status of a file in the diff"""
@@ -32,7 +64,7 @@ class FileDiff:
     """
     path: str
     status: FileStatus
-    diff_lines: List[str]  # Unified diff format
+    diff_lines: str        # Unified diff text
     additions: int = 0     # Number of added lines
     deletions: int = 0     # Number of deleted lines
     similarity: float = 1.0  # 0.0 to 1.0, how similar the files are
@@ -41,10 +73,10 @@ class FileDiff:
         return {
             "path": self.path,
             "status": self.status.value,
-            "diff": "".join(self.diff_lines),
+            "diff": self.diff_lines,
             "additions": self.additions,
             "deletions": self.deletions,
-            "similarity": round(self.similarity, 2),
+            "similarity": self.similarity,
         }
 
 
@@ -56,34 +88,45 @@ class DiffResult:
     Summarizes changes and provides per-file diffs.
     """
     files: List[FileDiff]
+    # Content hashes of the new file set, only computed on request; pass
+    # back as old_hashes on the next regeneration to skip rehashing
+    hashes: Dict[str, str] = field(default_factory=dict)
+    # Per-status file counts; compute_diff tallies these while building
+    # the file list, otherwise they are counted once on construction
+    _counts: Optional[Dict[FileStatus, int]] = field(default=None, repr=False)
+    
+    def __post_init__(self):
+        if self._counts is None:
+            self._counts = Counter(f.status for f in self.files)
     
     @property
     def added_count(self) -> int:
-        return sum(1 for f in self.files if f.status == FileStatus.ADDED)
+        return self._counts.get(FileStatus.ADDED, 0)
     
     @property
     def removed_count(self) -> int:
-        return sum(1 for f in self.files if f.status == FileStatus.REMOVED)
+        return self._counts.get(FileStatus.REMOVED, 0)
     
     @property
     def modified_count(self) -> int:
-        return sum(1 for f in self.files if f.status == FileStatus.MODIFIED)
+        return self._counts.get(FileStatus.MODIFIED, 0)
     
     @property
     def unchanged_count(self) -> int:
-        return sum(1 for f in self.files if f.status == FileStatus.UNCHANGED)
+        return self._counts.get(FileStatus.UNCHANGED, 0)
     
     def to_dict(self) -> Dict:
-        return {
-            "summary": {
-                "added": self.added_count,
-                "removed": self.removed_count,
-                "modified": self.modified_count,
-                "unchanged": self.unchanged_count,
-                "total": len(self.files),
-            },
+        summary = {
+            status.value: self._counts.get(status, 0) for status in FileStatus
+        }
+        summary["total"] = len(self.files)
+        result = {
+            "summary": summary,
             "files": [f.to_dict() for f in self.files],
         }
+        if self.hashes:
+            result["hashes"] = self.hashes
+        return result
     
     def get_changed_files(self) -> List[FileDiff]:
         """Get only files that changed (added, removed, or modified)"""
@@ -93,9 +136,19 @@ class DiffResult:
         ]
 
 
+def content_hash(content: str) -> str:
+    """Hex digest used to detect unchanged files"""
+    data = content.encode("utf-8")
+    if xxhash is not None:
+        return xxhash.xxh3_128_hexdigest(data)
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
 def compute_diff(
     old_files: Dict[str, str],
-    new_files: Dict[str, str]
+    new_files: Dict[str, str],
+    old_hashes: Optional[Dict[str, str]] = None,
+    with_hashes: bool = False
 ) -> DiffResult:
     """
     Compute deterministic file-level diffs between two file sets.
@@ -108,102 +161,288 @@ def compute_diff(
     Args:
         old_files: Dictionary of path -> content for old version
         new_files: Dictionary of path -> content for new version
+        old_hashes: Optional content hashes of old_files, typically the
+            ``hashes`` of the previous DiffResult. Paths without a hash
+            are compared by content.
+        with_hashes: Hash the new file set into DiffResult.hashes even
+            without old_hashes, to start a regeneration cycle. Implied
+            when old_hashes is given.
         
     Returns:
         DiffResult with all file diffs
     """
-    diffs: List[FileDiff] = []
+    diffs: Dict[str, FileDiff] = {}
+    modified: List[str] = []
+    counts = {status: 0 for status in FileStatus}
+    new_hashes: Dict[str, str] = {}
+    if with_hashes or old_hashes is not None:
+        new_hashes = {path: content_hash(content) for path, content in new_files.items()}
     
-    # Get all unique paths
-    all_paths = set(old_files.keys()) | set(new_files.keys())
+    # Get all unique paths (key views union without copying to sets first)
+    all_paths = sorted(old_files.keys() | new_files.keys())
     
-    for path in sorted(all_paths):
+    for path in all_paths:
         old_content = old_files.get(path, "")
         new_content = new_files.get(path, "")
         
         if path not in old_files:
             # New file added
-            diffs.append(FileDiff(
+            diff_lines, line_count = _generate_add_diff(path, new_content)
+            diffs[path] = FileDiff(
                 path=path,
                 status=FileStatus.ADDED,
-                diff_lines=_generate_add_diff(path, new_content),
-                additions=new_content.count("\n") + 1 if new_content else 0,
+                diff_lines=diff_lines,
+                additions=line_count,
                 deletions=0,
                 similarity=0.0,
-            ))
+            )
+            counts[FileStatus.ADDED] += 1
         
         elif path not in new_files:
             # File removed
-            diffs.append(FileDiff(
+            diff_lines, line_count = _generate_remove_diff(path, old_content)
+            diffs[path] = FileDiff(
                 path=path,
                 status=FileStatus.REMOVED,
-                diff_lines=_generate_remove_diff(path, old_content),
+                diff_lines=diff_lines,
                 additions=0,
-                deletions=old_content.count("\n") + 1 if old_content else 0,
+                deletions=line_count,
                 similarity=0.0,
-            ))
+            )
+            counts[FileStatus.REMOVED] += 1
         
-        elif old_content != new_content:
-            # File modified
-            diff_lines = list(unified_diff(
-                old_content.splitlines(keepends=True),
-                new_content.splitlines(keepends=True),
-                fromfile=f"a/{path}",
-                tofile=f"b/{path}",
-                lineterm=""
-            ))
-            
-            additions = sum(1 for line in diff_lines if line.startswith("+") and not line.startswith("+++"))
-            deletions = sum(1 for line in diff_lines if line.startswith("-") and not line.startswith("---"))
-            
-            # Calculate similarity
-            similarity = SequenceMatcher(None, old_content, new_content).ratio()
-            
-            diffs.append(FileDiff(
-                path=path,
-                status=FileStatus.MODIFIED,
-                diff_lines=diff_lines,
-                additions=additions,
-                deletions=deletions,
-                similarity=similarity,
-            ))
+        elif (
+            old_hashes[path] != new_hashes[path]
+            if old_hashes is not None and path in old_hashes
+            else old_content != new_content
+        ):
+            # File modified; diffed below
+            modified.append(path)
+            counts[FileStatus.MODIFIED] += 1
         
         else:
             # File unchanged
-            diffs.append(FileDiff(
+            diffs[path] = FileDiff(
                 path=path,
                 status=FileStatus.UNCHANGED,
-                diff_lines=[],
+                diff_lines="",
                 additions=0,
                 deletions=0,
                 similarity=1.0,
-            ))
+            )
+            counts[FileStatus.UNCHANGED] += 1
+    
+    # Modified files are independent of each other. The native backends
+    # release the GIL, so they can be diffed across threads.
+    old_contents = [old_files[path] for path in modified]
+    new_contents = [new_files[path] for path in modified]
+    workers = min(len(modified), os.cpu_count() or 1)
+    if workers > 1 and pygit2 is not None and Indel is not None:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            modified_diffs = list(executor.map(_diff_modified, modified, old_contents, new_contents))
+    else:
+        modified_diffs = list(map(_diff_modified, modified, old_contents, new_contents))
     
-    return DiffResult(files=diffs)
+    for file_diff in modified_diffs:
+        diffs[file_diff.path] = file_diff
+    
+    return DiffResult(
+        files=[diffs[path] for path in all_paths],
+        hashes=new_hashes,
+        _counts=counts,
+    )
 
 
-def _generate_add_diff(path: str, content: str) -> List[str]:
-    """Generate diff lines for a newly added file"""
-    lines = [
-        f"--- /dev/null\n",
-        f"+++ b/{path}\n",
-        f"@@ -0,0 +1,{content.count(chr(10)) + 1} @@\n",
-    ]
-    for line in content.splitlines():
-        lines.append(f"+{line}\n")
+def _diff_modified(path: str, old_content: str, new_content: str) -> FileDiff:
+    """Diff a single file present in both versions with differing content"""
+    diff_lines, additions, deletions = _unified_diff(path, old_content, new_content)
+    
+    return FileDiff(
+        path=path,
+        status=FileStatus.MODIFIED,
+        diff_lines=diff_lines,
+        additions=additions,
+        deletions=deletions,
+        similarity=_similarity(old_content, new_content),
+    )
+
+
+def _unified_diff(path: str, old_content: str, new_content: str) -> Tuple[str, int, int]:
+    """
+    Generate the unified diff for a modified file.
+    
+    Returns:
+        Tuple of (diff text, additions, deletions)
+    """
+    if pygit2 is not None:
+        # libgit2 Myers diff over the raw buffers; line stats come for free.
+        # The patch points into these buffers without owning them, so they
+        # must stay referenced until text and line_stats have been read.
+        old_bytes = old_content.encode("utf-8")
+        new_bytes = new_content.encode("utf-8")
+        patch = pygit2.Patch.create_from(
+            old_bytes,
+            new_bytes,
+            old_as_path=path,
+            new_as_path=path,
+        )
+        text = patch.text
+        _, additions, deletions = patch.line_stats
+        # Drop the "diff --git"/"index" preamble so every status shares the
+        # plain ---/+++ header of the add/remove diffs
+        return text[text.find("\n--- ") + 1:], additions, deletions
+    
+    diff_lines = list(unified_diff(
+        _split_lines(old_content),
+        _split_lines(new_content),
+        fromfile=f"a/{path}",
+        tofile=f"b/{path}",
+    ))
+    
+    # Single pass over the diff; only check for the file header on a match
+    additions = deletions = 0
+    for i, line in enumerate(diff_lines):
+        c0 = line[:1]
+        if c0 == "+" and line[:3] != "+++":
+            additions += 1
+        elif c0 == "-" and line[:3] != "---":
+            deletions += 1
+        if line[-1:] != "\n":
+            # Last line of a file without a trailing newline, marked as git does
+            diff_lines[i] = line + "\n\\ No newline at end of file\n"
+    
+    return "".join(diff_lines), additions, deletions
+
+
+def _split_lines(content: str) -> List[str]:
+    """Split on "\\n" only, keeping line endings, as git and patch do"""
+    lines = [line + "\n" for line in content.split("\n")]
+    # The piece after the final newline is empty or an unterminated line
+    lines[-1] = lines[-1][:-1]
+    if not lines[-1]:
+        lines.pop()
     return lines
 
 
-def _generate_remove_diff(path: str, content: str) -> List[str]:
-    """Generate diff lines for a removed file"""
-    lines = [
-        f"--- a/{path}\n",
-        f"+++ /dev/null\n",
-        f"@@ -1,{content.count(chr(10)) + 1} +0,0 @@\n",
+def _similarity(old_content: str, new_content: str) -> float:
+    """
+    Similarity ratio between two file contents (0.0 to 1.0).
+    
+    Similarity is display-only, so files that are clearly rewrites get the
+    cheap upper bound instead of a full O(N*M) match.
+    """
+    old_len, new_len = len(old_content), len(new_content)
+    upper = 2 * min(old_len, new_len) / max(1, old_len + new_len)
+    if upper < SIMILARITY_THRESHOLD:
+        return upper
+    
+    if Indel is not None:
+        # Bit-parallel LCS, same 2*M/T definition as SequenceMatcher.ratio()
+        return Indel.normalized_similarity(old_content, new_content)
+    
+    matcher = SequenceMatcher(None, old_content, new_content, autojunk=False)
+    # quick_ratio() is an O(N+M) multiset bound on ratio()
+    quick = matcher.quick_ratio()
+    if quick < SIMILARITY_THRESHOLD:
+        return quick
+    return matcher.ratio()
+
+
+def pairwise_similarity(versions: List[Dict[str, str]]) -> List[List[float]]:
+    """
+    Similarity matrix across several generated versions of a project.
+    
+    Useful when regenerating N variants and picking the one closest to a
+    reference. Each version is compared as a whole, with its files
+    concatenated in path order.
+    
+    Args:
+        versions: List of path -> content dictionaries
+        
+    Returns:
+        N x N matrix where [i][j] is the similarity of versions i and j
+    """
+    texts = [
+        "\n".join(files[path] for path in sorted(files))
+        for files in versions
     ]
-    for line in content.splitlines():
-        lines.append(f"-{line}\n")
-    return lines
+    
+    if cdist is not None:
+        # All pairs in one native call, spread across cores without the GIL
+        matrix = cdist(
+            texts, texts,
+            scorer=Indel.normalized_similarity,
+            dtype=numpy.float64,
+            workers=-1,
+        )
+        return matrix.tolist()
+    
+    n = len(texts)
+    matrix = [[1.0] * n for _ in range(n)]
+    for i in range(n):
+        for j in range(i + 1, n):
+            matrix[i][j] = matrix[j][i] = _exact_similarity(texts[i], texts[j])
+    return matrix
+
+
+def _exact_similarity(a: str, b: str) -> float:
+    """Untruncated 2*M/T ratio, matching the cdist scorer where available"""
+    if Indel is not None:
+        return Indel.normalized_similarity(a, b)
+    return SequenceMatcher(None, a, b, autojunk=False).ratio()
+
+
+def _generate_add_diff(path: str, content: str) -> Tuple[str, int]:
+    """
+    Generate diff lines for a newly added file.
+    
+    Returns:
+        Tuple of (diff text, line count)
+    """
+    lines = content.splitlines()
+    line_count = _line_count(content, lines)
+    header = (
+        f"--- /dev/null\n"
+        f"+++ b/{path}\n"
+        f"@@ -0,0 +{_hunk_range(line_count)} @@\n"
+    )
+    return header + _prefix_lines("+", lines), line_count
+
+
+def _generate_remove_diff(path: str, content: str) -> Tuple[str, int]:
+    """
+    Generate diff lines for a removed file.
+    
+    Returns:
+        Tuple of (diff text, line count)
+    """
+    lines = content.splitlines()
+    line_count = _line_count(content, lines)
+    header = (
+        f"--- a/{path}\n"
+        f"+++ /dev/null\n"
+        f"@@ -{_hunk_range(line_count)} +0,0 @@\n"
+    )
+    return header + _prefix_lines("-", lines), line_count
+
+
+def _line_count(content: str, lines: List[str]) -> int:
+    """Line count of content, counting a trailing newline as a final line"""
+    return len(lines) + (1 if content.endswith("\n") else 0)
+
+
+def _hunk_range(line_count: int) -> str:
+    """Hunk range for a whole file; an empty range starts at line 0"""
+    if line_count == 0:
+        return "0,0"
+    return f"1,{line_count}"
+
+
+def _prefix_lines(prefix: str, lines: List[str]) -> str:
+    """Prefix every line, newline-terminated, in one join"""
+    if not lines:
+        return ""
+    return prefix + ("\n" + prefix).join(lines) + "\n"
 
 
 def apply_selective_merge(
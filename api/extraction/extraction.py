@@ -4,13 +4,21 @@ CPS Extraction Module
 Extracts Canonical Project Specification from natural language using LLM.
 Uses editable prompt templates from the prompts directory.
 """
+import copy
+import functools
 import json
 import os
-from typing import Dict, Any
+from collections import OrderedDict
+from typing import Dict, Any, AsyncIterator, Tuple
 from pathlib import Path
 from openai import AsyncOpenAI
 from dotenv import load_dotenv
 
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
 load_dotenv()
 
 api_key = os.getenv("OPENAI_API_KEY")
@@ -21,13 +29,38 @@ client = AsyncOpenAI(api_key=api_key if api_key != "your_api_key_here" else "MIS
 
 # Path to prompts directory
 PROMPTS_DIR = Path(__file__).parent.parent / "prompts"
+_PROMPT_PATH = str(PROMPTS_DIR / "extraction.txt")
+
+# Re-read prompt files on every call so edits show up without a restart
+DEBUG = os.getenv("DEBUG") == "1"
+
+# Parsed extraction results for recently seen inputs
+EXTRACTION_CACHE_SIZE = 128
+_extraction_cache: "OrderedDict[Tuple[str, str], Dict[str, Any]]" = OrderedDict()
 
 
+@functools.lru_cache(maxsize=1)
 def load_extraction_prompt() -> str:
-    """Load the extraction prompt from file, or use fallback"""
-    prompt_file = PROMPTS_DIR / "extraction.txt"
-    if prompt_file.exists():
-        return prompt_file.read_text(encoding="utf-8")
+    """
+    Load the extraction system prompt from file, or use fallback.
+    
+    The user input is sent as its own message, so the {text} placeholder
+    is replaced with a pointer to it. Keeping the system prompt
+    byte-identical across calls lets the provider serve it from its
+    prompt cache. The result is cached for the life of the process; call
+    load_extraction_prompt.cache_clear() after editing the file.
+    """
+    prompt = _read_extraction_prompt().replace("{text}", "(provided in the user message)")
+    return f"You are a structured data extractor.\n\n{prompt}"
+
+
+def _read_extraction_prompt() -> str:
+    """Read the extraction prompt template, or use fallback"""
+    try:
+        with open(_PROMPT_PATH, "rb") as f:
+            return f.read().decode("utf-8")
+    except FileNotFoundError:
+        pass
     
     # Fallback to inline prompt if file doesn't exist
     return """Extract the information explicitly stated in the user input.
@@ -97,34 +130,72 @@ async def extract_cps(text: str) -> Dict[str, Any]:
     Extract CPS from natural language description.
     
     Uses the extraction prompt template from the prompts directory.
+    Successful results are cached in-process, so repeated inputs skip the
+    LLM call entirely.
     """
     try:
-        extraction_prompt = load_extraction_prompt()
+        if DEBUG:
+            load_extraction_prompt.cache_clear()
+        system_prompt = load_extraction_prompt()
+        
+        cache_key = (system_prompt, text)
+        cached = _extraction_cache.get(cache_key)
+        if cached is not None:
+            _extraction_cache.move_to_end(cache_key)
+            return copy.deepcopy(cached)
         
         response = await client.chat.completions.create(
             model="gpt-4o",
             messages=[
-                {"role": "system", "content": "You are a structured data extractor."},
-                {"role": "user", "content": extraction_prompt.replace("{text}", text)}
+                # Static prefix first so consecutive calls share it
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": text}
             ],
             response_format={"type": "json_object"}
         )
         content = response.choices[0].message.content
-        return json.loads(content)
+        result = json.loads(content)
+        
+        _extraction_cache[cache_key] = copy.deepcopy(result)
+        if len(_extraction_cache) > EXTRACTION_CACHE_SIZE:
+            _extraction_cache.popitem(last=False)
+        return result
     except Exception as e:
         # Fallback or error handling
         return {"error": str(e)}
 
 
-async def refine_code(cps: Dict[str, Any], files: Dict[str, str], feedback: str) -> Dict[str, Any]:
+class _CompletionStreamReader:
+    """Async file-like view of a streamed chat completion, for ijson"""
+    
+    def __init__(self, stream: Any):
+        self._chunks = stream.__aiter__()
+    
+    async def read(self, size: int = -1) -> bytes:
+        # ijson probes the stream type with read(0); don't consume a chunk
+        if size == 0:
+            return b""
+        # Return the next non-empty content delta; b"" signals end of stream
+        while True:
+            try:
+                chunk = await self._chunks.__anext__()
+            except StopAsyncIteration:
+                return b""
+            if chunk.choices and chunk.choices[0].delta.content:
+                return chunk.choices[0].delta.content.encode("utf-8")
+
+
+async def stream_refined_files(
+    cps: Dict[str, Any], files: Dict[str, str], feedback: str
+) -> AsyncIterator[Tuple[str, Any]]:
     """
-    Refine generated code based on user feedback.
+    Refine generated code, yielding (path, content) as each file completes.
     
-    Note: This function uses LLM to modify code. The output should be
-    reviewed by the user before deployment.
+    The completion is streamed and parsed incrementally with ijson, so
+    callers can start handling files before generation finishes. Without
+    ijson the stream is buffered and parsed once at the end.
     """
-    try:
-        prompt = f"""
+    prompt = f"""
         You are an expert full-stack AI engineer. 
         A user has generated a FastAPI project and has some feedback or discovered bugs.
         
@@ -145,16 +216,43 @@ async def refine_code(cps: Dict[str, Any], files: Dict[str, str], feedback: str)
         - Include ALL files in the output (except unchanged binary files if any) to maintain a complete project state.
         - Return ONLY the JSON object.
         """
-        
-        response = await client.chat.completions.create(
-            model="gpt-4o",
-            messages=[
-                {"role": "system", "content": "You are a code refiner and bug fixer. Always return a full file map in valid JSON format."},
-                {"role": "user", "content": prompt}
-            ],
-            response_format={"type": "json_object"}
-        )
-        return json.loads(response.choices[0].message.content)
+    
+    response = await client.chat.completions.create(
+        model="gpt-4o",
+        messages=[
+            {"role": "system", "content": "You are a code refiner and bug fixer. Always return a full file map in valid JSON format."},
+            {"role": "user", "content": prompt}
+        ],
+        response_format={"type": "json_object"},
+        stream=True,
+    )
+    
+    if ijson is not None:
+        reader = _CompletionStreamReader(response)
+        async for path, content in ijson.kvitems_async(reader, "", use_float=True):
+            yield path, content
+        return
+    
+    # Fallback: buffer the whole completion
+    parts = []
+    async for chunk in response:
+        if chunk.choices and chunk.choices[0].delta.content:
+            parts.append(chunk.choices[0].delta.content)
+    for path, content in json.loads("".join(parts)).items():
+        yield path, content
+
+
+async def refine_code(cps: Dict[str, Any], files: Dict[str, str], feedback: str) -> Dict[str, Any]:
+    """
+    Refine generated code based on user feedback.
+    
+    Note: This function uses LLM to modify code. The output should be
+    reviewed by the user before deployment.
+    """
+    try:
+        return {
+            path: content
+            async for path, content in stream_refined_files(cps, files, feedback)
+        }
     except Exception as e:
         return {"error": str(e)}
-
@@ -9,6 +9,7 @@ Rules:
 - No auto-deployment
 - All generation is template-based and deterministic
 """
+import functools
 from typing import Dict, Any
 
 
@@ -241,10 +242,23 @@ def generate_production_config(cps_data: Dict[str, Any]) -> str:
             "Production config generation requires environment.type to be 'production'"
         )
     
-    project_name = cps_data.get("project_name", "API")
-    features = cps_data.get("features", {})
+    llm_provider = cps_data.get("llm_provider", {})
+    if isinstance(llm_provider, str):
+        provider_type = llm_provider
+    else:
+        provider_type = llm_provider.get("type", "openai")
     
-    config = f'''# Production Configuration Notes for {project_name}
+    return _production_config(
+        cps_data.get("project_name", "API"),
+        provider_type,
+        bool(cps_data.get("features", {}).get("rag")),
+    )
+
+
+@functools.lru_cache(maxsize=128)
+def _production_config(project_name: str, provider_type: str, rag: bool) -> str:
+    """Production notes, memoized on the only CPS values they depend on"""
+    parts = [f'''# Production Configuration Notes for {project_name}
 #
 # This file provides generic production deployment guidance.
 # No specific cloud provider is assumed.
@@ -253,27 +267,21 @@ def generate_production_config(cps_data: Dict[str, Any]) -> str:
 
 The following environment variables MUST be set in your production environment:
 
-'''
+''']
     
     # List required env vars based on features
-    llm_provider = cps_data.get("llm_provider", {})
-    if isinstance(llm_provider, str):
-        provider_type = llm_provider
-    else:
-        provider_type = llm_provider.get("type", "openai")
-    
     if provider_type == "openai":
-        config += "- `OPENAI_API_KEY`: Your OpenAI API key\n"
+        parts.append("- `OPENAI_API_KEY`: Your OpenAI API key\n")
     elif provider_type == "azure_openai":
-        config += """- `AZURE_OPENAI_API_KEY`: Your Azure OpenAI API key
+        parts.append("""- `AZURE_OPENAI_API_KEY`: Your Azure OpenAI API key
 - `AZURE_OPENAI_ENDPOINT`: Your Azure OpenAI endpoint
 - `AZURE_OPENAI_DEPLOYMENT_NAME`: Your deployment name
-"""
+""")
     
-    if features.get("rag"):
-        config += "- `DATABASE_URL`: Production database connection string\n"
+    if rag:
+        parts.append("- `DATABASE_URL`: Production database connection string\n")
     
-    config += '''
+    parts.append('''
 ## Security Checklist
 
 - [ ] API keys are stored securely (not in code)
@@ -288,6 +296,6 @@ The following environment variables MUST be set in your production environment:
 - Stateless design allows horizontal scaling
 - Consider connection pooling for database
 - Use CDN for static assets if applicable
-'''
+''')
     
-    return config
+    return "".join(parts)
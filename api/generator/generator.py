@@ -10,24 +10,182 @@ Rules:
 - No AI-written backend logic
 - Enhancements are optional and explicit
 """
-from jinja2 import Environment, FileSystemLoader
+import anyio
+from jinja2 import Environment, FileSystemBytecodeCache, PackageLoader, StrictUndefined, Template
+import functools
+import io
+import logging
 import os
+import sys
 import json
-from typing import Dict, Any, Optional
+import zipfile
+from typing import Dict, Any, Iterator, List, Optional, Tuple, Union
 from .models import CPS
+from .environment_generator import (
+    generate_docker_compose,
+    generate_dockerfile,
+    generate_production_config,
+)
+from .openapi_generator import generate_openapi_spec, openapi_to_json, openapi_to_yaml
+from .test_generator import generate_tests
 
+try:
+    import yaml
+except ImportError:
+    yaml = None
 
-TEMPLATE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "templates"))
-env = Environment(loader=FileSystemLoader(TEMPLATE_DIR))
 
+logger = logging.getLogger(__name__)
 
-def generate_project(cps: CPS) -> Dict[str, str]:
+
+JINJA_CACHE_DIR = os.getenv(
+    "JINJA_CACHE_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "fastapi_generator", "jinja"),
+)
+
+
+def _bytecode_cache() -> Optional[FileSystemBytecodeCache]:
+    """
+    On-disk cache of compiled template code, shared across processes.
+    
+    Falls back to Jinja's per-user temp directory when the cache dir is not
+    writable (e.g. read-only serverless home), and to no cache at all if
+    neither can be created (Jinja raises RuntimeError when its temp
+    directory is not safe to use).
+    """
+    try:
+        os.makedirs(JINJA_CACHE_DIR, exist_ok=True)
+        return FileSystemBytecodeCache(directory=JINJA_CACHE_DIR)
+    except OSError:
+        pass
+    try:
+        return FileSystemBytecodeCache()
+    except (OSError, RuntimeError):
+        return None
+
+
+# Templates ship inside the api package (read via its resource loader, so
+# zipped installs work) and do not change at runtime, so skip mtime checks
+# and never evict compiled templates
+env = Environment(
+    loader=PackageLoader("api", "templates"),
+    bytecode_cache=_bytecode_cache(),
+    auto_reload=False,
+    cache_size=-1,
+    undefined=StrictUndefined,
+)
+
+# Every template generate_project can render
+_TEMPLATE_PATHS = (
+    "app/main.py.jinja",
+    "app/core/llm.py.jinja",
+    "app/schemas.py.jinja",
+    "app/__init__.py.jinja",
+    "requirements.txt.jinja",
+    "README.md.jinja",
+    ".env.example.jinja",
+    "app/core/feature_flags.py.jinja",
+    "app/api/ingest.py.jinja",
+    "app/api/query.py.jinja",
+    "app/core/vector_store.py.jinja",
+    "app/api/chat.py.jinja",
+    "app/api/module.py.jinja",
+    "app/api/_modules_manifest.jinja",
+    "Dockerfile.jinja",
+    "docker-compose.yml.jinja",
+    "deployment.yaml.jinja",
+    "service.yaml.jinja",
+    "vercel.json.jinja",
+)
+
+
+def _load_templates() -> Dict[str, Template]:
+    """
+    Compile the known templates once.
+    
+    Runs at import, so a missing or syntactically broken template fails
+    startup instead of producing partial projects at request time.
+    """
+    return {path: env.get_template(path) for path in _TEMPLATE_PATHS}
+
+
+_COMPILED = _load_templates()
+
+
+def _get_template(path: str) -> Template:
+    """Precompiled template, going through the loader only for unknown paths"""
+    template = _COMPILED.get(path)
+    if template is None:
+        template = env.get_template(path)
+    return template
+
+
+# Fixed package markers; every generated project shares these strings
+_CORE_INIT = sys.intern("# Core module\n")
+_API_INIT = sys.intern("# API module\n")
+
+# Renders all dynamic modules in one call; the separator cannot occur in
+# generated Python source
+_MODULES_MANIFEST = "app/api/_modules_manifest.jinja"
+_MODULE_SEPARATOR = "\x1e"
+
+
+def _render_modules(cps: CPS, base_context: Dict[str, Any]) -> Dict[str, str]:
+    """
+    Render every module in cps.modules with a single template call.
+    
+    Returns:
+        Dictionary mapping module file paths to content, in module order
+    """
+    rendered = _get_template(_MODULES_MANIFEST).render(**base_context, separator=_MODULE_SEPARATOR)
+    contents = rendered.split(_MODULE_SEPARATOR)
+    if len(contents) != len(cps.modules) + 1:
+        raise ValueError("module output contains the manifest separator")
+    return {
+        f"{cps.project_name}/app/api/{module}.py": content
+        for module, content in zip(cps.modules, contents)
+    }
+
+
+def _flat_view(cps: CPS) -> Dict[str, Any]:
+    """
+    Flat template values for the most-read nested CPS fields.
+    
+    Templates read these as ``f.feature_chat`` etc., a single lookup instead
+    of walking ``cps.features.chat`` on every access.
+    """
+    return {
+        "feature_chat": cps.features.chat,
+        "feature_rag": cps.features.rag,
+        "feature_streaming": cps.features.streaming,
+        "feature_embeddings": cps.features.embeddings,
+        "environment_type": cps.environment.type,
+    }
+
+
+async def generate_project(cps: CPS) -> Dict[str, str]:
     """
     Generate a complete FastAPI project from CPS.
     
     This is the main entry point for code generation.
     All outputs are deterministic and derived from CPS.
     
+    Generation is CPU-bound, so it runs on a worker thread to keep the
+    event loop serving other requests meanwhile.
+    
+    Args:
+        cps: Canonical Project Specification
+        
+    Returns:
+        Dictionary mapping file paths to content
+    """
+    return await anyio.to_thread.run_sync(generate_project_sync, cps)
+
+
+def generate_project_sync(cps: CPS) -> Dict[str, str]:
+    """
+    Synchronous implementation of generate_project.
+    
     Args:
         cps: Canonical Project Specification
         
@@ -35,71 +193,64 @@ def generate_project(cps: CPS) -> Dict[str, str]:
         Dictionary mapping file paths to content
     """
     files: Dict[str, str] = {}
+    # Templates read the model's attributes directly; the dict dump is only
+    # built (once) for the code-based generators
+    base_context = {"cps": cps, "f": _flat_view(cps)}
     cps_dict = cps.model_dump()
     
     # =========================================================================
     # Feature #1: Contract-First (OpenAPI) Mode
     # =========================================================================
     if cps.generation_options.openapi_first:
-        from .openapi_generator import generate_openapi_spec, openapi_to_json
-        try:
-            import yaml
-            from .openapi_generator import openapi_to_yaml
-            spec = generate_openapi_spec(cps_dict)
-            files[f"{cps.project_name}/openapi.json"] = openapi_to_json(spec)
+        spec = generate_openapi_spec(cps_dict)
+        files[f"{cps.project_name}/openapi.json"] = openapi_to_json(spec)
+        # PyYAML not available: only generate JSON
+        if yaml is not None:
             files[f"{cps.project_name}/openapi.yaml"] = openapi_to_yaml(spec)
-        except ImportError:
-            # PyYAML not available, only generate JSON
-            from .openapi_generator import generate_openapi_spec, openapi_to_json
-            spec = generate_openapi_spec(cps_dict)
-            files[f"{cps.project_name}/openapi.json"] = openapi_to_json(spec)
     
     # =========================================================================
     # Feature #3: Environment & Deployment Profiles
     # =========================================================================
     if cps.environment.generate_dockerfile:
         try:
-            dockerfile_template = env.get_template("Dockerfile.jinja")
-            files[f"{cps.project_name}/Dockerfile"] = dockerfile_template.render(cps=cps_dict)
+            dockerfile_template = _get_template("Dockerfile.jinja")
+            files[f"{cps.project_name}/Dockerfile"] = dockerfile_template.render(**base_context)
         except Exception as e:
             # Fallback to code-based generation
-            from .environment_generator import generate_dockerfile
             files[f"{cps.project_name}/Dockerfile"] = generate_dockerfile(cps_dict)
     
     if cps.environment.generate_compose:
         try:
-            compose_template = env.get_template("docker-compose.yml.jinja")
-            files[f"{cps.project_name}/docker-compose.yml"] = compose_template.render(cps=cps_dict)
+            compose_template = _get_template("docker-compose.yml.jinja")
+            files[f"{cps.project_name}/docker-compose.yml"] = compose_template.render(**base_context)
         except Exception as e:
             # Fallback to code-based generation
-            from .environment_generator import generate_docker_compose
             files[f"{cps.project_name}/docker-compose.yml"] = generate_docker_compose(cps_dict)
 
     # Feature: Kubernetes Environment
     if cps.environment.type == "kubernetes":
         try:
-            deploy_template = env.get_template("deployment.yaml.jinja")
-            files[f"{cps.project_name}/deployment.yaml"] = deploy_template.render(cps=cps_dict)
-            service_template = env.get_template("service.yaml.jinja")
-            files[f"{cps.project_name}/service.yaml"] = service_template.render(cps=cps_dict)
+            deploy_template = _get_template("deployment.yaml.jinja")
+            files[f"{cps.project_name}/deployment.yaml"] = deploy_template.render(**base_context)
+            service_template = _get_template("service.yaml.jinja")
+            files[f"{cps.project_name}/service.yaml"] = service_template.render(**base_context)
         except Exception as e:
-            print(f"Error generating Kubernetes manifests: {e}")
+            logger.error("Error generating Kubernetes manifests: %s", e)
 
     # Feature: Vercel Environment
     if cps.environment.type == "vercel":
         try:
-            vercel_template = env.get_template("vercel.json.jinja")
-            files[f"{cps.project_name}/vercel.json"] = vercel_template.render(cps=cps_dict)
+            vercel_template = _get_template("vercel.json.jinja")
+            files[f"{cps.project_name}/vercel.json"] = vercel_template.render(**base_context)
         except Exception as e:
-            print(f"Error generating Vercel config: {e}")
+            logger.error("Error generating Vercel config: %s", e)
 
     # Feature: Production Environment
     if cps.environment.type == "production":
-        from .environment_generator import generate_production_config
         try:
             files[f"{cps.project_name}/PRODUCTION.md"] = generate_production_config(cps_dict)
         except Exception as e:
-            print(f"Error generating production config: {e}")
+            logger.error("Error generating production config: %s", e)
     
     # =========================================================================
     # Core Templates
@@ -121,8 +272,8 @@ def generate_project(cps: CPS) -> Dict[str, str]:
     templates.append(("app/core/feature_flags.py.jinja", f"{cps.project_name}/app/core/feature_flags.py"))
     
     # Add core __init__.py
-    files[f"{cps.project_name}/app/core/__init__.py"] = '# Core module\n'
-    files[f"{cps.project_name}/app/api/__init__.py"] = '# API module\n'
+    files[f"{cps.project_name}/app/core/__init__.py"] = _CORE_INIT
+    files[f"{cps.project_name}/app/api/__init__.py"] = _API_INIT
     
     # =========================================================================
     # Mode-Specific Templates
@@ -137,40 +288,18 @@ def generate_project(cps: CPS) -> Dict[str, str]:
         templates.append(("app/api/chat.py.jinja", f"{cps.project_name}/app/api/chat.py"))
     
     # =========================================================================
-    # Dynamic Modules
+    # Render All Templates
     # =========================================================================
-    for module in cps.modules:
-        templates.append((
-            "app/api/module.py.jinja",
-            f"{cps.project_name}/app/api/{module}.py",
-            {"module": module}
-        ))
+    # Templates are compiled and checked at import, and StrictUndefined
+    # turns template bugs into errors rather than silently blank output
+    for template_path, output_path in templates:
+        files[output_path] = _get_template(template_path).render(**base_context)
     
     # =========================================================================
-    # Render All Templates
+    # Dynamic Modules
     # =========================================================================
-    for template_info in templates:
-        if len(template_info) == 2:
-            template_path, output_path = template_info
-            context = {"cps": cps_dict}
-        else:
-            template_path, output_path, extra_context = template_info
-            context = {"cps": cps_dict, **extra_context}
-        
-        try:
-            template = env.get_template(template_path)
-            rendered = template.render(**context)
-            files[output_path] = rendered
-        except Exception as e:
-            # Handle missing or optional templates
-            if "chat.py" in template_path and not cps.features.chat:
-                continue
-            if "__init__.py" in template_path:
-                files[output_path] = ""
-                continue
-            
-            # Log the error but don't fail completely
-            print(f"Warning: Error rendering {template_path}: {e}")
+    if cps.modules:
+        files.update(_render_modules(cps, base_context))
     
     # =========================================================================
     # Feature #11: Failure-First Design
@@ -183,65 +312,132 @@ def generate_project(cps: CPS) -> Dict[str, str]:
     # Feature #9: Test Generation
     # =========================================================================
     if cps.generation_options.generate_tests:
-        from .test_generator import generate_tests
         test_files = generate_tests(cps_dict)
         files.update(test_files)
     
     return files
 
 
+class _ZipChunkSink(io.RawIOBase):
+    """Write-only, unseekable sink that hands written bytes back in chunks"""
+    
+    def __init__(self) -> None:
+        super().__init__()
+        self._chunks: List[bytes] = []
+    
+    def writable(self) -> bool:
+        return True
+    
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+    
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+# Export compression modes -> (compression, compresslevel). DEFLATE level 1
+# is several times faster than the default 6 on small source files for a
+# ~10% larger archive
+ZIP_COMPRESSION: Dict[str, Tuple[int, Optional[int]]] = {
+    "fast": (zipfile.ZIP_DEFLATED, 1),
+    "normal": (zipfile.ZIP_DEFLATED, 6),
+    "stored": (zipfile.ZIP_STORED, None),
+}
+
+
+def iter_zip_archive(files: Dict[str, Union[str, bytes]], compression: str = "fast") -> Iterator[bytes]:
+    """
+    Stream a ZIP archive of files, one compressed member at a time.
+    
+    The sink is unseekable, so zipfile writes data descriptors after each
+    member instead of rewinding to patch headers; only the member being
+    compressed is ever held in memory.
+    
+    Args:
+        files: Dictionary of file paths to content; bytes are written as
+            is, text is UTF-8 encoded exactly once
+        compression: Key of ZIP_COMPRESSION ("fast", "normal" or "stored")
+        
+    Returns:
+        Iterator of archive byte chunks
+    """
+    compress_type, compresslevel = ZIP_COMPRESSION[compression]
+    sink = _ZipChunkSink()
+    with zipfile.ZipFile(sink, "w", compress_type, compresslevel=compresslevel) as zip_file:
+        for path, content in files.items():
+            if isinstance(content, str):
+                content = content.encode("utf-8")
+            zip_file.writestr(path, content)
+            yield sink.drain()
+    # Central directory, written on close
+    yield sink.drain()
+
+
 def generate_todo_file(cps_data: Dict[str, Any]) -> str:
     """
     Generate TODO.md with incomplete features and implementation notes.
     
     Feature #11: Failure-First Design
     """
-    project_name = cps_data.get("project_name", "Project")
     features = cps_data.get("features", {})
-    
-    content = f"""# TODO: {project_name}
+    return _todo_file(
+        cps_data.get("project_name", "Project"),
+        bool(features.get("chat")),
+        bool(features.get("rag")),
+        bool(features.get("streaming")),
+        bool(features.get("embeddings")),
+    )
+
+
+@functools.lru_cache(maxsize=128)
+def _todo_file(project_name: str, chat: bool, rag: bool, streaming: bool, embeddings: bool) -> str:
+    """TODO.md content, memoized on the only CPS values it depends on"""
+    parts = [f"""# TODO: {project_name}
 
 This file lists features that need implementation or review.
 Generated from CPS - update this as you complete items.
 
 ## Required Implementations
 
-"""
+"""]
     
-    if features.get("chat"):
-        content += """### Chat Feature
+    if chat:
+        parts.append("""### Chat Feature
 - [ ] Implement actual LLM chat logic in `app/api/chat.py`
 - [ ] Configure system prompts in `app/core/llm.py`
 - [ ] Add error handling for API rate limits
 
-"""
+""")
     
-    if features.get("rag"):
-        content += """### RAG Feature
+    if rag:
+        parts.append("""### RAG Feature
 - [ ] Implement document ingestion in `app/api/ingest.py`
 - [ ] Configure vector store connection in `app/core/vector_store.py`
 - [ ] Implement semantic search in `app/api/query.py`
 - [ ] Add chunking strategy for large documents
 
-"""
+""")
     
-    if features.get("streaming"):
-        content += """### Streaming Feature
+    if streaming:
+        parts.append("""### Streaming Feature
 - [ ] Implement SSE streaming in chat endpoint
 - [ ] Add streaming response handling
 - [ ] Test with various client libraries
 
-"""
+""")
     
-    if features.get("embeddings"):
-        content += """### Embeddings Feature
+    if embeddings:
+        parts.append("""### Embeddings Feature
 - [ ] Configure embedding model
 - [ ] Implement batch embedding generation
 - [ ] Add caching for frequently used embeddings
 
-"""
+""")
     
-    content += """## General TODOs
+    parts.append("""## General TODOs
 
 - [ ] Review and update environment variables in `.env.example`
 - [ ] Add production logging configuration
@@ -254,9 +450,9 @@ Generated from CPS - update this as you complete items.
 
 Items marked with `NotImplementedError` in code require implementation.
 See individual files for specific TODO comments.
-"""
+""")
     
-    return content
+    return "".join(parts)
 
 
 def generate_schemas_only(cps: CPS) -> Dict[str, str]:
@@ -266,13 +462,13 @@ def generate_schemas_only(cps: CPS) -> Dict[str, str]:
     Feature #6: Request/Response Schema Visualization
     """
     files = {}
-    cps_dict = cps.model_dump()
+    base_context = {"cps": cps, "f": _flat_view(cps)}
     
     try:
-        template = env.get_template("app/schemas.py.jinja")
-        files[f"{cps.project_name}/app/schemas.py"] = template.render(cps=cps_dict)
+        template = _get_template("app/schemas.py.jinja")
+        files[f"{cps.project_name}/app/schemas.py"] = template.render(**base_context)
     except Exception as e:
-        print(f"Error generating schemas: {e}")
+        logger.error("Error generating schemas: %s", e)
     
     return files
 
@@ -9,8 +9,265 @@ Rules:
 - No inferred schemas
 - All paths and schemas are deterministic
 """
-from typing import Dict, Any, List
+from collections import defaultdict
+from typing import Dict, Any, DefaultDict, Iterator, List, Tuple, Union
+import functools
 import json
+import sys
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import yaml
+except ImportError:
+    yaml = None
+
+
+# Distinct CPS shapes (everything but title/description) whose spec body is
+# kept; repeated previews of the same project skip the rebuild
+SPEC_CACHE_SIZE: int = 256
+
+# Bytes per chunk when streaming a spec as JSON
+STREAM_CHUNK_SIZE: int = 64 * 1024
+
+# Stdlib encoders for when orjson is missing, configured once; they keep no
+# state between calls, so sharing them across requests and threads is safe
+_INDENT_ENCODER = json.JSONEncoder(indent=2)
+_COMPACT_ENCODER = json.JSONEncoder(separators=(",", ":"))
+
+
+# =============================================================================
+# Static spec fragments
+# =============================================================================
+# Built once at import and shared by every generated spec. Specs only ever
+# read these; path items are copied before CPS endpoints are merged in.
+
+_MESSAGE_RESPONSE_SCHEMA: Dict[str, Any] = {
+    "type": "object",
+    "properties": {
+        "message": {"type": "string"}
+    },
+    "required": ["message"]
+}
+
+# Response block shared by every CPS-declared endpoint
+_OK_MESSAGE_RESPONSE: Dict[str, Any] = {
+    "200": {
+        "description": "Successful response",
+        "content": {
+            "application/json": {
+                "schema": {"$ref": "#/components/schemas/MessageResponse"}
+            }
+        }
+    }
+}
+
+# Shape of a CPS-declared operation; copied and filled in per endpoint
+_OP_TEMPLATE: Dict[str, Any] = {
+    "summary": None,
+    "operationId": None,
+    "responses": _OK_MESSAGE_RESPONSE,
+}
+
+_ROOT_OPERATION: Dict[str, Any] = {
+    "summary": "Root endpoint",
+    "operationId": "root",
+    "responses": {
+        "200": {
+            "description": "Welcome message",
+            "content": {
+                "application/json": {
+                    "schema": {"$ref": "#/components/schemas/MessageResponse"}
+                }
+            }
+        }
+    }
+}
+
+_CHAT_SCHEMAS: Dict[str, Any] = {
+    "ChatRequest": {
+        "type": "object",
+        "properties": {
+            "message": {"type": "string", "description": "User message"},
+            "stream": {"type": "boolean", "default": False}
+        },
+        "required": ["message"]
+    },
+    "ChatResponse": {
+        "type": "object",
+        "properties": {
+            "reply": {"type": "string", "description": "AI response"}
+        },
+        "required": ["reply"]
+    },
+}
+
+_RAG_SCHEMAS: Dict[str, Any] = {
+    "IngestRequest": {
+        "type": "object",
+        "properties": {
+            "content": {"type": "string", "description": "Content to ingest"},
+            "metadata": {
+                "type": "object",
+                "additionalProperties": {"type": "string"}
+            }
+        },
+        "required": ["content"]
+    },
+    "IngestResponse": {
+        "type": "object",
+        "properties": {
+            "status": {"type": "string"},
+            "message": {"type": "string"}
+        },
+        "required": ["status", "message"]
+    },
+    "QueryRequest": {
+        "type": "object",
+        "properties": {
+            "query": {"type": "string", "description": "Search query"}
+        },
+        "required": ["query"]
+    },
+    "QueryResponse": {
+        "type": "object",
+        "properties": {
+            "reply": {"type": "string"},
+            "context_used": {
+                "type": "array",
+                "items": {"type": "string"}
+            }
+        },
+        "required": ["reply", "context_used"]
+    },
+}
+
+_MODULE_BASE_SCHEMA: Dict[str, Any] = {
+    "type": "object",
+    "properties": {
+        "name": {"type": "string"},
+        "description": {"type": "string", "nullable": True}
+    },
+    "required": ["name"]
+}
+
+_CHAT_PATHS: Dict[str, Any] = {
+    "/chat": {
+        "post": {
+            "summary": "Chat with AI",
+            "operationId": "chat",
+            "tags": ["chat"],
+            "requestBody": {
+                "required": True,
+                "content": {
+                    "application/json": {
+                        "schema": {"$ref": "#/components/schemas/ChatRequest"}
+                    }
+                }
+            },
+            "responses": {
+                "200": {
+                    "description": "Chat response",
+                    "content": {
+                        "application/json": {
+                            "schema": {"$ref": "#/components/schemas/ChatResponse"}
+                        }
+                    }
+                }
+            }
+        }
+    }
+}
+
+_RAG_PATHS: Dict[str, Any] = {
+    "/ingest": {
+        "post": {
+            "summary": "Ingest content into knowledge base",
+            "operationId": "ingest",
+            "tags": ["rag"],
+            "requestBody": {
+                "required": True,
+                "content": {
+                    "application/json": {
+                        "schema": {"$ref": "#/components/schemas/IngestRequest"}
+                    }
+                }
+            },
+            "responses": {
+                "200": {
+                    "description": "Ingestion result",
+                    "content": {
+                        "application/json": {
+                            "schema": {"$ref": "#/components/schemas/IngestResponse"}
+                        }
+                    }
+                }
+            }
+        }
+    },
+    "/query": {
+        "post": {
+            "summary": "Query the knowledge base",
+            "operationId": "query",
+            "tags": ["rag"],
+            "requestBody": {
+                "required": True,
+                "content": {
+                    "application/json": {
+                        "schema": {"$ref": "#/components/schemas/QueryRequest"}
+                    }
+                }
+            },
+            "responses": {
+                "200": {
+                    "description": "Query response",
+                    "content": {
+                        "application/json": {
+                            "schema": {"$ref": "#/components/schemas/QueryResponse"}
+                        }
+                    }
+                }
+            }
+        }
+    }
+}
+
+# Security schemes and the matching requirement per auth type; any other
+# type (including "none") gets neither
+_SECURITY_SCHEMES: Dict[str, Dict[str, Any]] = {
+    "api_key": {
+        "ApiKeyAuth": {
+            "type": "apiKey",
+            "in": "header",
+            "name": "X-API-Key"
+        }
+    },
+    "jwt": {
+        "BearerAuth": {
+            "type": "http",
+            "scheme": "bearer",
+            "bearerFormat": "JWT"
+        }
+    },
+}
+
+_SECURITY_REQUIREMENTS: Dict[str, Dict[str, List[str]]] = {
+    "api_key": {"ApiKeyAuth": []},
+    "jwt": {"BearerAuth": []},
+}
+
+
+if yaml is not None:
+    # libyaml's C emitter when PyYAML was built with it; specs hold only
+    # plain dicts, lists and scalars, so the safe representer suffices
+    class _SpecDumper(getattr(yaml, "CSafeDumper", yaml.SafeDumper)):
+        """Dumper that writes shared fragments out in full instead of as &id aliases"""
+        
+        def ignore_aliases(self, data: Any) -> bool:
+            return True
 
 
 def generate_openapi_spec(cps_data: Dict[str, Any]) -> Dict[str, Any]:
@@ -24,95 +281,120 @@ def generate_openapi_spec(cps_data: Dict[str, Any]) -> Dict[str, Any]:
         cps_data: CPS model as dictionary
         
     Returns:
-        OpenAPI 3.0 specification as dictionary
+        OpenAPI 3.0 specification as dictionary. Nested sections are
+        cached and shared between calls; do not mutate the result.
     """
-    project_name = cps_data.get("project_name", "API")
-    description = cps_data.get("description", "")
-    features = cps_data.get("features", {})
-    endpoints = cps_data.get("endpoints", [])
-    modules = cps_data.get("modules", [])
-    mode = cps_data.get("mode", "general")
-    auth = cps_data.get("auth", {})
+    try:
+        body = _cached_spec_body(_spec_shape(cps_data))
+    except TypeError:
+        # Unhashable values in a hand-built dict; build without the cache
+        body = _build_spec_body(cps_data)
     
-    spec = {
+    spec: Dict[str, Any] = {
         "openapi": "3.0.3",
         "info": {
-            "title": project_name,
-            "description": description,
+            "title": cps_data.get("project_name", "API"),
+            "description": cps_data.get("description", ""),
             "version": "1.0.0"
         },
         "servers": [
             {"url": "http://localhost:8000", "description": "Local development server"}
         ],
-        "paths": {},
-        "components": {
-            "schemas": _generate_schemas(cps_data),
-            "securitySchemes": _generate_security_schemes(auth)
-        }
+        **body,
     }
+    return spec
+
+
+def _spec_shape(cps_data: Dict[str, Any]) -> Tuple[Any, ...]:
+    """
+    Hashable key of every CPS value the paths, components and security
+    depend on. Raises TypeError if a value is unhashable.
+    """
+    key = (
+        cps_data.get("mode", "general"),
+        tuple(cps_data.get("features", {}).items()),
+        tuple(tuple(endpoint.items()) for endpoint in cps_data.get("endpoints", [])),
+        tuple(cps_data.get("modules", [])),
+        tuple(cps_data.get("auth", {}).items()),
+    )
+    hash(key)
+    return key
+
+
+@functools.lru_cache(maxsize=SPEC_CACHE_SIZE)
+def _cached_spec_body(shape: Tuple[Any, ...]) -> Dict[str, Any]:
+    """
+    Spec body for a CPS shape, built once per distinct shape.
+    
+    The result is shared between every spec with this shape, so callers
+    must treat generated specs as read-only.
+    """
+    mode, features, endpoints, modules, auth = shape
+    return _build_spec_body({
+        "mode": mode,
+        "features": dict(features),
+        "endpoints": [dict(endpoint) for endpoint in endpoints],
+        "modules": list(modules),
+        "auth": dict(auth),
+    })
+
+
+@functools.lru_cache(maxsize=1024)
+def _operation_id(path: str) -> str:
+    """operationId derived from an endpoint path"""
+    return path.strip("/").replace("/", "_") or "custom_endpoint"
+
+
+def _build_spec_body(cps_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Build the paths, components and security sections of the spec"""
+    features = cps_data.get("features", {})
+    endpoints = cps_data.get("endpoints", [])
+    modules = cps_data.get("modules", [])
+    mode = cps_data.get("mode", "general")
+    auth = cps_data.get("auth", {})
+    
+    # Operations are assigned straight into their path item; the item is
+    # created on first use, so paths keep their first-seen order
+    paths: DefaultDict[str, Dict[str, Any]] = defaultdict(dict)
     
     # Add root endpoint
-    spec["paths"]["/"] = {
-        "get": {
-            "summary": "Root endpoint",
-            "operationId": "root",
-            "responses": {
-                "200": {
-                    "description": "Welcome message",
-                    "content": {
-                        "application/json": {
-                            "schema": {"$ref": "#/components/schemas/MessageResponse"}
-                        }
-                    }
-                }
-            }
-        }
-    }
+    paths["/"] = {"get": _ROOT_OPERATION}
     
     # Add mode-specific endpoints
+    # Path items are copied so CPS endpoints on the same path don't write
+    # into the shared constants
     if mode == "rag_only":
-        spec["paths"].update(_generate_rag_endpoints())
+        paths.update((path, dict(item)) for path, item in _generate_rag_endpoints().items())
     elif features.get("chat"):
-        spec["paths"].update(_generate_chat_endpoints())
+        paths.update((path, dict(item)) for path, item in _generate_chat_endpoints().items())
     
     # Add endpoints from CPS
     for endpoint in endpoints:
         path = endpoint.get("path", "/")
         method = endpoint.get("method", "GET").lower()
         uses_llm = endpoint.get("uses_llm", False)
-        endpoint_desc = endpoint.get("description", f"Endpoint for {path}")
-        
-        if path not in spec["paths"]:
-            spec["paths"][path] = {}
-        
-        operation_id = path.strip("/").replace("/", "_") or "custom_endpoint"
-        
-        spec["paths"][path][method] = {
-            "summary": endpoint_desc,
-            "operationId": operation_id,
-            "responses": {
-                "200": {
-                    "description": "Successful response",
-                    "content": {
-                        "application/json": {
-                            "schema": {"$ref": "#/components/schemas/MessageResponse"}
-                        }
-                    }
-                }
-            }
-        }
+        if "description" in endpoint:
+            endpoint_desc = endpoint["description"]
+        else:
+            endpoint_desc = f"Endpoint for {path}"
         
+        operation = _OP_TEMPLATE.copy()
+        operation["summary"] = endpoint_desc
+        operation["operationId"] = _operation_id(path)
         if uses_llm:
-            spec["paths"][path][method]["tags"] = ["llm"]
+            operation["tags"] = ["llm"]
+        
+        paths[path][method] = operation
     
     # Add module endpoints
     for module in modules:
+        module_name = module.capitalize()
+        # One read-only $ref object per module, shared by all three uses
+        ref_schema = {"$ref": sys.intern(f"#/components/schemas/{module_name}Base")}
         module_path = f"/{module}"
-        if module_path not in spec["paths"]:
-            spec["paths"][module_path] = {}
         
         # GET list
-        spec["paths"][module_path]["get"] = {
+        paths[module_path]["get"] = {
             "summary": f"List {module}",
             "operationId": f"list_{module}",
             "tags": [module],
@@ -123,7 +405,7 @@ def generate_openapi_spec(cps_data: Dict[str, Any]) -> Dict[str, Any]:
                         "application/json": {
                             "schema": {
                                 "type": "array",
-                                "items": {"$ref": f"#/components/schemas/{module.capitalize()}Base"}
+                                "items": ref_schema
                             }
                         }
                     }
@@ -132,7 +414,7 @@ def generate_openapi_spec(cps_data: Dict[str, Any]) -> Dict[str, Any]:
         }
         
         # POST create
-        spec["paths"][module_path]["post"] = {
+        paths[module_path]["post"] = {
             "summary": f"Create {module}",
             "operationId": f"create_{module}",
             "tags": [module],
@@ -140,22 +422,31 @@ def generate_openapi_spec(cps_data: Dict[str, Any]) -> Dict[str, Any]:
                 "required": True,
                 "content": {
                     "application/json": {
-                        "schema": {"$ref": f"#/components/schemas/{module.capitalize()}Base"}
+                        "schema": ref_schema
                     }
                 }
             },
             "responses": {
                 "201": {
-                    "description": f"{module.capitalize()} created",
+                    "description": f"{module_name} created",
                     "content": {
                         "application/json": {
-                            "schema": {"$ref": f"#/components/schemas/{module.capitalize()}Base"}
+                            "schema": ref_schema
                         }
                     }
                 }
             }
         }
     
+    spec: Dict[str, Any] = {
+        # Plain dict for the serializers (PyYAML's safe dumper rejects defaultdict)
+        "paths": dict(paths),
+        "components": {
+            "schemas": _generate_schemas(cps_data),
+            "securitySchemes": _generate_security_schemes(auth)
+        }
+    }
+    
     # Apply security if auth is configured
     if auth.get("type") != "none":
         spec["security"] = [_get_security_requirement(auth)]
@@ -165,224 +456,92 @@ def generate_openapi_spec(cps_data: Dict[str, Any]) -> Dict[str, Any]:
 
 def _generate_schemas(cps_data: Dict[str, Any]) -> Dict[str, Any]:
     """Generate JSON schemas from CPS configuration"""
-    schemas = {
-        "MessageResponse": {
-            "type": "object",
-            "properties": {
-                "message": {"type": "string"}
-            },
-            "required": ["message"]
-        }
-    }
+    schemas: Dict[str, Any] = {"MessageResponse": _MESSAGE_RESPONSE_SCHEMA}
     
     features = cps_data.get("features", {})
     modules = cps_data.get("modules", [])
     
     # Chat schemas
     if features.get("chat"):
-        schemas["ChatRequest"] = {
-            "type": "object",
-            "properties": {
-                "message": {"type": "string", "description": "User message"},
-                "stream": {"type": "boolean", "default": False}
-            },
-            "required": ["message"]
-        }
-        schemas["ChatResponse"] = {
-            "type": "object",
-            "properties": {
-                "reply": {"type": "string", "description": "AI response"}
-            },
-            "required": ["reply"]
-        }
+        schemas.update(_CHAT_SCHEMAS)
     
     # RAG schemas
     if features.get("rag"):
-        schemas["IngestRequest"] = {
-            "type": "object",
-            "properties": {
-                "content": {"type": "string", "description": "Content to ingest"},
-                "metadata": {
-                    "type": "object",
-                    "additionalProperties": {"type": "string"}
-                }
-            },
-            "required": ["content"]
-        }
-        schemas["IngestResponse"] = {
-            "type": "object",
-            "properties": {
-                "status": {"type": "string"},
-                "message": {"type": "string"}
-            },
-            "required": ["status", "message"]
-        }
-        schemas["QueryRequest"] = {
-            "type": "object",
-            "properties": {
-                "query": {"type": "string", "description": "Search query"}
-            },
-            "required": ["query"]
-        }
-        schemas["QueryResponse"] = {
-            "type": "object",
-            "properties": {
-                "reply": {"type": "string"},
-                "context_used": {
-                    "type": "array",
-                    "items": {"type": "string"}
-                }
-            },
-            "required": ["reply", "context_used"]
-        }
+        schemas.update(_RAG_SCHEMAS)
     
-    # Module schemas
+    # Module schemas share one body; only the name differs
     for module in modules:
-        schemas[f"{module.capitalize()}Base"] = {
-            "type": "object",
-            "properties": {
-                "name": {"type": "string"},
-                "description": {"type": "string", "nullable": True}
-            },
-            "required": ["name"]
-        }
+        schemas[f"{module.capitalize()}Base"] = _MODULE_BASE_SCHEMA
     
     return schemas
 
 
 def _generate_security_schemes(auth: Dict[str, Any]) -> Dict[str, Any]:
     """Generate security schemes based on auth configuration"""
-    auth_type = auth.get("type", "none")
-    
-    if auth_type == "api_key":
-        return {
-            "ApiKeyAuth": {
-                "type": "apiKey",
-                "in": "header",
-                "name": "X-API-Key"
-            }
-        }
-    elif auth_type == "jwt":
-        return {
-            "BearerAuth": {
-                "type": "http",
-                "scheme": "bearer",
-                "bearerFormat": "JWT"
-            }
-        }
-    
-    return {}
+    return _SECURITY_SCHEMES.get(auth.get("type", "none"), {})
 
 
-def _get_security_requirement(auth: Dict[str, Any]) -> Dict[str, List]:
+def _get_security_requirement(auth: Dict[str, Any]) -> Dict[str, List[str]]:
     """Get security requirement for operations"""
-    auth_type = auth.get("type", "none")
-    
-    if auth_type == "api_key":
-        return {"ApiKeyAuth": []}
-    elif auth_type == "jwt":
-        return {"BearerAuth": []}
-    
-    return {}
+    return _SECURITY_REQUIREMENTS.get(auth.get("type", "none"), {})
 
 
 def _generate_chat_endpoints() -> Dict[str, Any]:
-    """Generate chat-related endpoints"""
-    return {
-        "/chat": {
-            "post": {
-                "summary": "Chat with AI",
-                "operationId": "chat",
-                "tags": ["chat"],
-                "requestBody": {
-                    "required": True,
-                    "content": {
-                        "application/json": {
-                            "schema": {"$ref": "#/components/schemas/ChatRequest"}
-                        }
-                    }
-                },
-                "responses": {
-                    "200": {
-                        "description": "Chat response",
-                        "content": {
-                            "application/json": {
-                                "schema": {"$ref": "#/components/schemas/ChatResponse"}
-                            }
-                        }
-                    }
-                }
-            }
-        }
-    }
+    """Generate chat-related endpoints (shared constant; copy before mutating)"""
+    return _CHAT_PATHS
 
 
 def _generate_rag_endpoints() -> Dict[str, Any]:
-    """Generate RAG-related endpoints"""
-    return {
-        "/ingest": {
-            "post": {
-                "summary": "Ingest content into knowledge base",
-                "operationId": "ingest",
-                "tags": ["rag"],
-                "requestBody": {
-                    "required": True,
-                    "content": {
-                        "application/json": {
-                            "schema": {"$ref": "#/components/schemas/IngestRequest"}
-                        }
-                    }
-                },
-                "responses": {
-                    "200": {
-                        "description": "Ingestion result",
-                        "content": {
-                            "application/json": {
-                                "schema": {"$ref": "#/components/schemas/IngestResponse"}
-                            }
-                        }
-                    }
-                }
-            }
-        },
-        "/query": {
-            "post": {
-                "summary": "Query the knowledge base",
-                "operationId": "query",
-                "tags": ["rag"],
-                "requestBody": {
-                    "required": True,
-                    "content": {
-                        "application/json": {
-                            "schema": {"$ref": "#/components/schemas/QueryRequest"}
-                        }
-                    }
-                },
-                "responses": {
-                    "200": {
-                        "description": "Query response",
-                        "content": {
-                            "application/json": {
-                                "schema": {"$ref": "#/components/schemas/QueryResponse"}
-                            }
-                        }
-                    }
-                }
-            }
-        }
-    }
+    """Generate RAG-related endpoints (shared constant; copy before mutating)"""
+    return _RAG_PATHS
 
 
 def openapi_to_yaml(spec: Dict[str, Any]) -> str:
     """Convert OpenAPI spec to YAML format"""
-    try:
-        import yaml
-        return yaml.dump(spec, default_flow_style=False, sort_keys=False)
-    except ImportError:
+    if yaml is None:
         # Fallback to JSON if PyYAML not available
-        return json.dumps(spec, indent=2)
+        return openapi_to_json(spec)
+    return yaml.dump(spec, Dumper=_SpecDumper, default_flow_style=False, sort_keys=False)
 
 
-def openapi_to_json(spec: Dict[str, Any]) -> str:
-    """Convert OpenAPI spec to JSON format"""
-    return json.dumps(spec, indent=2)
+def openapi_to_json(spec: Dict[str, Any], indent: bool = True) -> str:
+    """
+    Convert OpenAPI spec to JSON format.
+    
+    Args:
+        spec: OpenAPI specification
+        indent: Pretty-print with 2-space indentation; compact otherwise
+    """
+    if orjson is not None:
+        return orjson.dumps(spec, option=orjson.OPT_INDENT_2 if indent else None).decode("utf-8")
+    if indent:
+        return _INDENT_ENCODER.encode(spec)
+    return _COMPACT_ENCODER.encode(spec)
+
+
+def iter_openapi_json(spec: Dict[str, Any], chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[Union[bytes, memoryview]]:
+    """
+    Encode an OpenAPI spec as indented JSON, incrementally.
+    
+    With orjson the document is encoded natively in a single pass and
+    handed out as chunk_size views over that one buffer. Otherwise the
+    stdlib encoder's small fragments are batched into chunk_size pieces,
+    so the full document is never held as one string.
+    """
+    if orjson is not None:
+        view = memoryview(orjson.dumps(spec, option=orjson.OPT_INDENT_2))
+        for start in range(0, len(view), chunk_size):
+            yield view[start:start + chunk_size]
+        return
+    
+    buffer: List[str] = []
+    size = 0
+    for fragment in _INDENT_ENCODER.iterencode(spec):
+        buffer.append(fragment)
+        size += len(fragment)
+        if size >= chunk_size:
+            yield "".join(buffer).encode("utf-8")
+            buffer.clear()
+            size = 0
+    if buffer:
+        yield "".join(buffer).encode("utf-8")
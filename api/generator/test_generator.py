@@ -12,74 +12,11 @@ Rules:
 from typing import Dict, Any
 
 
-def generate_tests(cps_data: Dict[str, Any]) -> Dict[str, str]:
-    """
-    Generate test files based on CPS configuration.
-    
-    Args:
-        cps_data: CPS model as dictionary
-        
-    Returns:
-        Dictionary of file paths to content
-    """
-    generation_options = cps_data.get("generation_options", {})
-    if not generation_options.get("generate_tests", True):
-        return {}  # Tests explicitly disabled
-    
-    project_name = cps_data.get("project_name", "app")
-    test_files = {}
-    
-    # Test configuration
-    test_files[f"{project_name}/tests/__init__.py"] = '''# Test package
-'''
-    
-    test_files[f"{project_name}/tests/conftest.py"] = generate_conftest(cps_data)
-    test_files[f"{project_name}/tests/test_health.py"] = generate_health_test(cps_data)
-    test_files[f"{project_name}/tests/test_schemas.py"] = generate_schema_tests(cps_data)
-    test_files[f"{project_name}/tests/test_feature_flags.py"] = generate_feature_flag_tests(cps_data)
-    
-    # Add requirements for testing
-    test_files[f"{project_name}/tests/requirements-test.txt"] = '''# Test dependencies
-pytest>=7.0.0
-pytest-asyncio>=0.21.0
-httpx>=0.24.0
-'''
-    
-    return test_files
-
-
-def generate_conftest(cps_data: Dict[str, Any]) -> str:
-    """Generate pytest configuration"""
-    return '''"""
-Pytest configuration and fixtures
-
-Generated from CPS - deterministic tests only.
-No external API mocking.
-"""
-import pytest
-from fastapi.testclient import TestClient
-from app.main import app
-
-
-@pytest.fixture
-def client():
-    """Create test client"""
-    return TestClient(app)
-
-
-@pytest.fixture
-def async_client():
-    """Create async test client"""
-    from httpx import AsyncClient
-    return AsyncClient(app=app, base_url="http://test")
-'''
-
+# =============================================================================
+# Fixed test file blocks (built once per process)
+# =============================================================================
 
-def generate_health_test(cps_data: Dict[str, Any]) -> str:
-    """Generate health endpoint test"""
-    project_name = cps_data.get("project_name", "API")
-    
-    return f'''"""
+HEALTH_TEST_TEMPLATE = '''"""
 Health Endpoint Tests for {project_name}
 
 These tests verify the API is running and responding correctly.
@@ -109,13 +46,7 @@ def test_invalid_endpoint_returns_404(client):
     assert response.status_code == 404
 '''
 
-
-def generate_schema_tests(cps_data: Dict[str, Any]) -> str:
-    """Generate schema validation tests"""
-    project_name = cps_data.get("project_name", "API")
-    features = cps_data.get("features", {})
-    
-    test_content = f'''"""
+SCHEMA_TESTS_HEADER = '''"""
 Schema Validation Tests for {project_name}
 
 These tests verify request/response schema validity.
@@ -136,9 +67,8 @@ def test_message_response_schema():
     pass  # Schema existence validated by import
 
 '''
-    
-    if features.get("chat"):
-        test_content += '''
+
+CHAT_SCHEMA_TESTS = '''
 # =============================================================================
 # Chat Schema Tests
 # =============================================================================
@@ -162,9 +92,8 @@ def test_chat_response_valid():
     assert response.reply == "Hello there"
 
 '''
-    
-    if features.get("rag"):
-        test_content += '''
+
+RAG_SCHEMA_TESTS = '''
 # =============================================================================
 # RAG Schema Tests
 # =============================================================================
@@ -188,16 +117,8 @@ def test_ingest_response_valid():
     assert response.status == "success"
 
 '''
-    
-    return test_content
-
 
-def generate_feature_flag_tests(cps_data: Dict[str, Any]) -> str:
-    """Generate feature flag enforcement tests"""
-    project_name = cps_data.get("project_name", "API")
-    features = cps_data.get("features", {})
-    
-    test_content = f'''"""
+FEATURE_FLAG_TESTS_TEMPLATE = '''"""
 Feature Flag Enforcement Tests for {project_name}
 
 These tests verify that feature flags are properly enforced.
@@ -220,22 +141,22 @@ from app.core.feature_flags import (
 
 def test_feature_chat_value():
     """Verify FEATURE_CHAT matches CPS"""
-    assert FEATURE_CHAT == {str(features.get("chat", False)).lower()}
+    assert FEATURE_CHAT == {chat}
 
 
 def test_feature_rag_value():
     """Verify FEATURE_RAG matches CPS"""
-    assert FEATURE_RAG == {str(features.get("rag", False)).lower()}
+    assert FEATURE_RAG == {rag}
 
 
 def test_feature_streaming_value():
     """Verify FEATURE_STREAMING matches CPS"""
-    assert FEATURE_STREAMING == {str(features.get("streaming", False)).lower()}
+    assert FEATURE_STREAMING == {streaming}
 
 
 def test_feature_embeddings_value():
     """Verify FEATURE_EMBEDDINGS matches CPS"""
-    assert FEATURE_EMBEDDINGS == {str(features.get("embeddings", False)).lower()}
+    assert FEATURE_EMBEDDINGS == {embeddings}
 
 
 # =============================================================================
@@ -277,5 +198,103 @@ async def test_feature_disabled_error_message():
     assert "my_feature" in str(exc_info.value)
     assert "disabled" in str(exc_info.value).lower()
 '''
+
+
+def generate_tests(cps_data: Dict[str, Any]) -> Dict[str, str]:
+    """
+    Generate test files based on CPS configuration.
+    
+    Args:
+        cps_data: CPS model as dictionary
+        
+    Returns:
+        Dictionary of file paths to content
+    """
+    generation_options = cps_data.get("generation_options", {})
+    if not generation_options.get("generate_tests", True):
+        return {}  # Tests explicitly disabled
+    
+    project_name = cps_data.get("project_name", "app")
+    test_files = {}
+    
+    # Test configuration
+    test_files[f"{project_name}/tests/__init__.py"] = '''# Test package
+'''
+    
+    test_files[f"{project_name}/tests/conftest.py"] = generate_conftest(cps_data)
+    test_files[f"{project_name}/tests/test_health.py"] = generate_health_test(cps_data)
+    test_files[f"{project_name}/tests/test_schemas.py"] = generate_schema_tests(cps_data)
+    test_files[f"{project_name}/tests/test_feature_flags.py"] = generate_feature_flag_tests(cps_data)
+    
+    # Add requirements for testing
+    test_files[f"{project_name}/tests/requirements-test.txt"] = '''# Test dependencies
+pytest>=7.0.0
+pytest-asyncio>=0.21.0
+httpx>=0.24.0
+'''
+    
+    return test_files
+
+
+def generate_conftest(cps_data: Dict[str, Any]) -> str:
+    """Generate pytest configuration"""
+    return '''"""
+Pytest configuration and fixtures
+
+Generated from CPS - deterministic tests only.
+No external API mocking.
+"""
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+
+
+@pytest.fixture
+def client():
+    """Create test client"""
+    return TestClient(app)
+
+
+@pytest.fixture
+def async_client():
+    """Create async test client"""
+    from httpx import AsyncClient
+    return AsyncClient(app=app, base_url="http://test")
+'''
+
+
+def generate_health_test(cps_data: Dict[str, Any]) -> str:
+    """Generate health endpoint test"""
+    return HEALTH_TEST_TEMPLATE.format_map(
+        {"project_name": cps_data.get("project_name", "API")}
+    )
+
+
+def generate_schema_tests(cps_data: Dict[str, Any]) -> str:
+    """Generate schema validation tests"""
+    features = cps_data.get("features", {})
+    
+    parts = [
+        SCHEMA_TESTS_HEADER.format_map(
+            {"project_name": cps_data.get("project_name", "API")}
+        )
+    ]
+    if features.get("chat"):
+        parts.append(CHAT_SCHEMA_TESTS)
+    if features.get("rag"):
+        parts.append(RAG_SCHEMA_TESTS)
+    
+    return "".join(parts)
+
+
+def generate_feature_flag_tests(cps_data: Dict[str, Any]) -> str:
+    """Generate feature flag enforcement tests"""
+    features = cps_data.get("features", {})
     
-    return test_content
+    return FEATURE_FLAG_TESTS_TEMPLATE.format_map({
+        "project_name": cps_data.get("project_name", "API"),
+        "chat": str(features.get("chat", False)).lower(),
+        "rag": str(features.get("rag", False)).lower(),
+        "streaming": str(features.get("streaming", False)).lower(),
+        "embeddings": str(features.get("embeddings", False)).lower(),
+    })
@@ -12,21 +12,34 @@ This API provides endpoints for:
 """
 import os
 import json
-import zipfile
-import io
 from typing import Dict, Any, Optional
 from fastapi import FastAPI, HTTPException, Depends, Header
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 from .generator.models import CPS
-from .extraction.extraction import extract_cps, refine_code
-from .generator.generator import generate_project
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON response encoded with orjson (C/SIMD) instead of the stdlib encoder"""
+    
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
+# Handlers that return this directly skip FastAPI's jsonable_encoder pass
+DefaultResponse = ORJSONResponse if orjson is not None else JSONResponse
 
 app = FastAPI(
     title="FastAPI Generator API",
     description="AI-powered FastAPI project generator with CPS-based code generation",
-    version="2.0.0"
+    version="2.0.0",
+    default_response_class=DefaultResponse,
 )
 
 # Vercel requires CORS to be handled correctly
@@ -40,6 +53,10 @@ app.add_middleware(
 
 API_KEY = os.getenv("GENERATOR_API_KEY", "fastapi-gen-secret")
 
+# CPS's compiled pydantic-core validator, bound once; validating the dict
+# directly skips building a kwargs mapping for every request
+_validate_cps = CPS.__pydantic_validator__.validate_python
+
 
 async def verify_api_key(x_api_key: str = Header(None)):
     if x_api_key != API_KEY:
@@ -64,6 +81,8 @@ def health():
 @app.post("/api/analyze")
 async def analyze(data: dict):
     """Extract CPS from natural language description"""
+    from .extraction.extraction import extract_cps
+    
     text = data.get("text")
     if not text:
         raise HTTPException(status_code=400, detail="Missing text input")
@@ -108,13 +127,17 @@ async def validate_cps(cps: CPS):
 @app.post("/api/generate")
 async def generate(cps: CPS):
     """Generate FastAPI project from CPS"""
-    files = generate_project(cps)
+    from .generator.generator import generate_project
+    
+    files = await generate_project(cps)
     return {"files": files}
 
 
 @app.post("/api/refine")
 async def refine(data: dict):
     """Refine generated code based on feedback"""
+    from .extraction.extraction import refine_code
+    
     cps = data.get("cps")
     files = data.get("files")
     feedback = data.get("feedback")
@@ -127,20 +150,37 @@ async def refine(data: dict):
 
 
 @app.post("/api/export")
-async def export_zip(data: dict):
-    """Export project as ZIP file"""
+async def export_zip(data: dict, compression: str = "fast"):
+    """
+    Export project as ZIP file.
+    
+    ?compression=fast|normal|stored picks DEFLATE level 1, DEFLATE level 6
+    or no compression; fast is the default.
+    """
+    from .generator.generator import ZIP_COMPRESSION, iter_zip_archive
+    
     files = data.get("files")
     if not files:
         raise HTTPException(status_code=400, detail="No files provided")
-    
-    zip_buffer = io.BytesIO()
-    with zipfile.ZipFile(zip_buffer, "a", zipfile.ZIP_DEFLATED, False) as zip_file:
-        for path, content in files.items():
-            zip_file.writestr(path, content)
-    
-    zip_buffer.seek(0)
+    if compression not in ZIP_COMPRESSION:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid compression: {compression}. Use one of: {', '.join(ZIP_COMPRESSION)}",
+        )
+    # Checked before streaming: once the 200 headers are sent a bad entry
+    # could only truncate the archive
+    if not isinstance(files, dict):
+        raise HTTPException(status_code=400, detail="files must be an object of path -> content")
+    invalid = [path for path, content in files.items() if not isinstance(content, (str, bytes))]
+    if invalid:
+        raise HTTPException(
+            status_code=400,
+            detail=f"File content must be a string: {', '.join(invalid)}",
+        )
+
+    # Compressed member by member while the client downloads
     return StreamingResponse(
-        zip_buffer,
+        iter_zip_archive(files, compression),
         media_type="application/x-zip-compressed",
         headers={"Content-Disposition": "attachment; filename=project.zip"}
     )
@@ -149,6 +189,9 @@ async def export_zip(data: dict):
 @app.post("/api/v1/generate")
 async def unified_generate(data: dict, token: str = Depends(verify_api_key)):
     """Unified generation endpoint (requires API key)"""
+    from .extraction.extraction import extract_cps
+    from .generator.generator import generate_project
+    
     idea = data.get("idea")
     if not idea:
         raise HTTPException(status_code=400, detail="Missing idea input")
@@ -160,12 +203,12 @@ async def unified_generate(data: dict, token: str = Depends(verify_api_key)):
     
     # 2. Validation (Internal)
     try:
-        cps = CPS(**extracted_data)
+        cps = _validate_cps(extracted_data)
     except Exception as e:
         raise HTTPException(status_code=422, detail=f"Validation failed: {str(e)}")
     
     # 3. Generation
-    files = generate_project(cps)
+    files = await generate_project(cps)
     return {"project_name": cps.project_name, "files": files}
 
 
@@ -174,20 +217,21 @@ async def unified_generate(data: dict, token: str = Depends(verify_api_key)):
 # =============================================================================
 
 @app.post("/api/openapi-preview")
-async def openapi_preview(cps: CPS):
+async def openapi_preview(cps: CPS, format: Optional[str] = None):
     """
     Generate OpenAPI 3.0 specification preview from CPS.
     
     The OpenAPI spec is derived strictly from CPS with no inference.
+    With ?format=json the indented spec document itself is streamed back.
     """
-    from .generator.openapi_generator import generate_openapi_spec, openapi_to_json
+    from .generator.openapi_generator import generate_openapi_spec, iter_openapi_json
     
     try:
         spec = generate_openapi_spec(cps.model_dump())
-        return {
-            "openapi_spec": spec,
-            "json": openapi_to_json(spec),
-        }
+        if format == "json":
+            return StreamingResponse(iter_openapi_json(spec), media_type="application/json")
+        # The response class serializes the spec once; no embedded string copy
+        return {"openapi_spec": spec}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"OpenAPI generation failed: {str(e)}")
 
@@ -223,16 +267,11 @@ async def get_schemas(cps: CPS):
     
     Schemas are derived deterministically from CPS.
     """
-    from .visualization.schema_visualizer import extract_schemas_from_cps, generate_json_schema
+    from .visualization.schema_visualizer import generate_schemas_payload
     
     try:
-        visualization = extract_schemas_from_cps(cps.model_dump())
-        json_schema = generate_json_schema(cps.model_dump())
-        return {
-            "pydantic_models": visualization.pydantic_models,
-            "json_schemas": visualization.json_schemas,
-            "complete_schema": json_schema,
-        }
+        # Body is spliced from JSON pre-encoded per cached visualization
+        return Response(generate_schemas_payload(cps.model_dump()), media_type="application/json")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Schema visualization failed: {str(e)}")
 
@@ -277,18 +316,21 @@ async def compute_diff(data: dict):
     """
     Compute file-level diffs between old and new file sets.
     
-    Use this when regenerating a project to see what changed.
+    Use this when regenerating a project to see what changed. Send
+    "with_hashes": true to get content hashes of new_files back, and pass
+    them as "old_hashes" next time to skip rehashing the old set.
     """
     from .diff.diff_engine import compute_diff as do_diff
     
     old_files = data.get("old_files", {})
     new_files = data.get("new_files", {})
+    old_hashes = data.get("old_hashes")
     
     if not new_files:
         raise HTTPException(status_code=400, detail="Missing new_files in request body")
     
     try:
-        result = do_diff(old_files, new_files)
+        result = do_diff(old_files, new_files, old_hashes, bool(data.get("with_hashes")))
         return result.to_dict()
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Diff computation failed: {str(e)}")
@@ -299,20 +341,23 @@ async def regenerate_with_diff(data: dict):
     """
     Regenerate project and return diff against previous version.
     
-    This allows users to see exactly what changed.
+    This allows users to see exactly what changed. "with_hashes" and
+    "old_hashes" work as for /api/diff; the hashes come back in the diff.
     """
     from .diff.diff_engine import compute_diff as do_diff
+    from .generator.generator import generate_project
     
     cps_data = data.get("cps")
     old_files = data.get("old_files", {})
+    old_hashes = data.get("old_hashes")
     
     if not cps_data:
         raise HTTPException(status_code=400, detail="Missing cps in request body")
     
     try:
-        cps = CPS(**cps_data)
-        new_files = generate_project(cps)
-        diff_result = do_diff(old_files, new_files)
+        cps = _validate_cps(cps_data)
+        new_files = await generate_project(cps)
+        diff_result = do_diff(old_files, new_files, old_hashes, bool(data.get("with_hashes")))
         
         return {
             "files": new_files,
@@ -363,6 +408,9 @@ async def update_prompt(name: str, data: dict):
     
     try:
         save_prompt(name, content)
+        if name == "extraction":
+            from .extraction.extraction import load_extraction_prompt
+            load_extraction_prompt.cache_clear()
         return {"status": "success", "name": name}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to save prompt: {str(e)}")
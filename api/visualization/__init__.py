@@ -2,11 +2,19 @@
 from .schema_visualizer import (
     extract_schemas_from_cps,
     generate_json_schema,
+    generate_json_schema_from_visualization,
+    get_schema_summary,
+    get_schema_summary_from_visualization,
+    generate_schemas_payload,
     SchemaVisualization,
 )
 
 __all__ = [
     "extract_schemas_from_cps",
     "generate_json_schema",
+    "generate_json_schema_from_visualization",
+    "get_schema_summary",
+    "get_schema_summary_from_visualization",
+    "generate_schemas_payload",
     "SchemaVisualization",
 ]
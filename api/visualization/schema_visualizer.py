@@ -9,76 +9,61 @@ Rules:
 - No undocumented fields
 - All schemas derived from CPS
 """
-from typing import Dict, Any, List, Optional
-from dataclasses import dataclass
+from typing import Dict, Any, List, Optional, Tuple
+from dataclasses import dataclass, field
+import functools
+import json
+import sys
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
-@dataclass
-class SchemaVisualization:
-    """
-    Container for schema visualization data.
-    
-    Contains both Pydantic model definitions and JSON Schema representations.
-    """
-    pydantic_models: Dict[str, str]  # Model name -> Python code
-    json_schemas: Dict[str, Dict[str, Any]]  # Model name -> JSON Schema
-    
-    def to_dict(self) -> Dict[str, Any]:
-        return {
-            "pydantic_models": self.pydantic_models,
-            "json_schemas": self.json_schemas,
-        }
 
+# Distinct (chat, rag, modules) combinations whose visualization is kept;
+# repeated previews of the same project skip the rebuild
+SCHEMA_CACHE_SIZE = 128
 
-def extract_schemas_from_cps(cps_data: Dict[str, Any]) -> SchemaVisualization:
-    """
-    Generate schema visualizations directly from CPS.
-    
-    This creates both Pydantic model code and JSON Schema representations
-    based on the CPS configuration.
-    
-    Args:
-        cps_data: CPS model as dictionary
-        
-    Returns:
-        SchemaVisualization with models and schemas
-    """
-    pydantic_models = {}
-    json_schemas = {}
-    
-    features = cps_data.get("features", {})
-    modules = cps_data.get("modules", [])
-    
-    # =========================================================================
-    # Base Models
-    # =========================================================================
-    
-    # MessageResponse (always included)
-    pydantic_models["MessageResponse"] = '''class MessageResponse(BaseModel):
+# Cached visualizations live for the life of the process; drop their
+# per-instance __dict__ where dataclasses support it (Python 3.10+)
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+# =============================================================================
+# Static schema entries
+# =============================================================================
+# Built once at import as (model name, Pydantic source, JSON Schema, field
+# count). Every visualization shares these objects, so callers must treat
+# them as read-only.
+
+_BASE_ENTRIES: Tuple[Tuple[str, str, Dict[str, Any], int], ...] = (
+    (
+        "MessageResponse",
+        '''class MessageResponse(BaseModel):
     """Standard message response"""
-    message: str'''
-    
-    json_schemas["MessageResponse"] = {
-        "type": "object",
-        "title": "MessageResponse",
-        "description": "Standard message response",
-        "properties": {
-            "message": {"type": "string"}
+    message: str''',
+        {
+            "type": "object",
+            "title": "MessageResponse",
+            "description": "Standard message response",
+            "properties": {
+                "message": {"type": "string"}
+            },
+            "required": ["message"]
         },
-        "required": ["message"]
-    }
-    
-    # =========================================================================
-    # Chat Schemas
-    # =========================================================================
-    
-    if features.get("chat"):
-        pydantic_models["ChatRequest"] = '''class ChatRequest(BaseModel):
+        1,
+    ),
+)
+
+_CHAT_ENTRIES: Tuple[Tuple[str, str, Dict[str, Any], int], ...] = (
+    (
+        "ChatRequest",
+        '''class ChatRequest(BaseModel):
     """Chat request with user message"""
     message: str
-    stream: Optional[bool] = False'''
-        
-        json_schemas["ChatRequest"] = {
+    stream: Optional[bool] = False''',
+        {
             "type": "object",
             "title": "ChatRequest",
             "description": "Chat request with user message",
@@ -87,13 +72,15 @@ def extract_schemas_from_cps(cps_data: Dict[str, Any]) -> SchemaVisualization:
                 "stream": {"type": "boolean", "default": False, "description": "Enable streaming response"}
             },
             "required": ["message"]
-        }
-        
-        pydantic_models["ChatResponse"] = '''class ChatResponse(BaseModel):
+        },
+        2,
+    ),
+    (
+        "ChatResponse",
+        '''class ChatResponse(BaseModel):
     """Chat response with AI reply"""
-    reply: str'''
-        
-        json_schemas["ChatResponse"] = {
+    reply: str''',
+        {
             "type": "object",
             "title": "ChatResponse",
             "description": "Chat response with AI reply",
@@ -101,19 +88,19 @@ def extract_schemas_from_cps(cps_data: Dict[str, Any]) -> SchemaVisualization:
                 "reply": {"type": "string", "description": "AI-generated response"}
             },
             "required": ["reply"]
-        }
-    
-    # =========================================================================
-    # RAG Schemas
-    # =========================================================================
-    
-    if features.get("rag"):
-        pydantic_models["IngestRequest"] = '''class IngestRequest(BaseModel):
+        },
+        1,
+    ),
+)
+
+_RAG_ENTRIES: Tuple[Tuple[str, str, Dict[str, Any], int], ...] = (
+    (
+        "IngestRequest",
+        '''class IngestRequest(BaseModel):
     """Request to ingest content into knowledge base"""
     content: str
-    metadata: Optional[Dict[str, str]] = None'''
-        
-        json_schemas["IngestRequest"] = {
+    metadata: Optional[Dict[str, str]] = None''',
+        {
             "type": "object",
             "title": "IngestRequest",
             "description": "Request to ingest content into knowledge base",
@@ -126,14 +113,16 @@ def extract_schemas_from_cps(cps_data: Dict[str, Any]) -> SchemaVisualization:
                 }
             },
             "required": ["content"]
-        }
-        
-        pydantic_models["IngestResponse"] = '''class IngestResponse(BaseModel):
+        },
+        2,
+    ),
+    (
+        "IngestResponse",
+        '''class IngestResponse(BaseModel):
     """Response after content ingestion"""
     status: str
-    message: str'''
-        
-        json_schemas["IngestResponse"] = {
+    message: str''',
+        {
             "type": "object",
             "title": "IngestResponse",
             "description": "Response after content ingestion",
@@ -142,14 +131,16 @@ def extract_schemas_from_cps(cps_data: Dict[str, Any]) -> SchemaVisualization:
                 "message": {"type": "string"}
             },
             "required": ["status", "message"]
-        }
-        
-        pydantic_models["QueryRequest"] = '''class QueryRequest(BaseModel):
+        },
+        2,
+    ),
+    (
+        "QueryRequest",
+        '''class QueryRequest(BaseModel):
     """Request to query the knowledge base"""
     query: str
-    top_k: Optional[int] = 5'''
-        
-        json_schemas["QueryRequest"] = {
+    top_k: Optional[int] = 5''',
+        {
             "type": "object",
             "title": "QueryRequest",
             "description": "Request to query the knowledge base",
@@ -158,14 +149,16 @@ def extract_schemas_from_cps(cps_data: Dict[str, Any]) -> SchemaVisualization:
                 "top_k": {"type": "integer", "default": 5, "description": "Number of results to return"}
             },
             "required": ["query"]
-        }
-        
-        pydantic_models["QueryResponse"] = '''class QueryResponse(BaseModel):
+        },
+        2,
+    ),
+    (
+        "QueryResponse",
+        '''class QueryResponse(BaseModel):
     """Response from knowledge base query"""
     reply: str
-    context_used: List[str]'''
-        
-        json_schemas["QueryResponse"] = {
+    context_used: List[str]''',
+        {
             "type": "object",
             "title": "QueryResponse",
             "description": "Response from knowledge base query",
@@ -178,34 +171,154 @@ def extract_schemas_from_cps(cps_data: Dict[str, Any]) -> SchemaVisualization:
                 }
             },
             "required": ["reply", "context_used"]
+        },
+        2,
+    ),
+)
+
+# Per-module model: the source is filled in with str.format and the JSON
+# Schema shares one properties/required pair between every module. required
+# is a tuple (encoded as a JSON array) so an accidental in-place edit raises
+# instead of changing every module's schema
+_MODULE_MODEL_SOURCE = '''class {model_name}(BaseModel):
+    """Base model for {module}"""
+    name: str
+    description: Optional[str] = None'''
+
+_MODULE_PROPERTIES: Dict[str, Any] = {
+    "name": {"type": "string"},
+    "description": {"type": "string", "nullable": True}
+}
+
+_MODULE_REQUIRED: Tuple[str, ...] = ("name",)
+
+_MODULE_FIELD_COUNT = len(_MODULE_PROPERTIES)
+
+
+def _dumps(data: Any) -> bytes:
+    """Compact UTF-8 JSON, byte-identical to what the API response classes emit"""
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _member(name: str, value: Any) -> bytes:
+    """Encoded '"name":value' member of a JSON object"""
+    return _dumps({name: value})[1:-1]
+
+
+def _join_members(members: Dict[str, bytes]) -> bytes:
+    """Encoded JSON object from encoded members, in dict order"""
+    return b"{" + b",".join(members.values()) + b"}"
+
+
+# Static entries pre-encoded at import: name -> (source member, schema member)
+_STATIC_MEMBERS: Dict[str, Tuple[bytes, bytes]] = {
+    name: (_member(name, source), _member(name, schema))
+    for name, source, schema, _ in _BASE_ENTRIES + _CHAT_ENTRIES + _RAG_ENTRIES
+}
+
+
+@dataclass(frozen=True, **_SLOTS)
+class SchemaVisualization:
+    """
+    Container for schema visualization data.
+    
+    Contains both Pydantic model definitions and JSON Schema representations.
+    Instances are cached and shared between callers; treat them as read-only.
+    """
+    pydantic_models: Dict[str, str]  # Model name -> Python code
+    json_schemas: Dict[str, Dict[str, Any]]  # Model name -> JSON Schema
+    field_counts: Dict[str, int] = field(default_factory=dict)  # Model name -> field count
+    # Encoded JSON of the two dicts above, set by extract_schemas_from_cps
+    pydantic_models_json: Optional[bytes] = None
+    json_schemas_json: Optional[bytes] = None
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "pydantic_models": self.pydantic_models,
+            "json_schemas": self.json_schemas,
         }
+
+
+def extract_schemas_from_cps(cps_data: Dict[str, Any]) -> SchemaVisualization:
+    """
+    Generate schema visualizations directly from CPS.
+    
+    This creates both Pydantic model code and JSON Schema representations
+    based on the CPS configuration. Results are cached per feature and
+    module combination and shared between calls; treat them as read-only.
+    
+    Args:
+        cps_data: CPS model as dictionary
+        
+    Returns:
+        SchemaVisualization with models and schemas
+    """
+    features = cps_data.get("features", {})
+    # Only these inputs shape the output, so they are the cache key
+    return _build_visualization(
+        bool(features.get("chat")),
+        bool(features.get("rag")),
+        tuple(cps_data.get("modules", [])),
+    )
+
+
+@functools.lru_cache(maxsize=SCHEMA_CACHE_SIZE)
+def _build_visualization(chat: bool, rag: bool, modules: Tuple[str, ...]) -> SchemaVisualization:
+    """Build the visualization for one (chat, rag, modules) combination"""
+    pydantic_models = {}
+    json_schemas = {}
+    field_counts = {}
+    # Encoded members, keyed like the dicts above so repeated names resolve
+    # the same way
+    model_members = {}
+    schema_members = {}
+    
+    # =========================================================================
+    # Base, Chat and RAG Schemas
+    # =========================================================================
+    
+    entries = _BASE_ENTRIES
+    if chat:
+        entries += _CHAT_ENTRIES
+    if rag:
+        entries += _RAG_ENTRIES
+    
+    for name, source, schema, field_count in entries:
+        pydantic_models[name] = source
+        json_schemas[name] = schema
+        field_counts[name] = field_count
+        model_members[name], schema_members[name] = _STATIC_MEMBERS[name]
     
     # =========================================================================
     # Module Schemas
     # =========================================================================
     
     for module in modules:
-        model_name = f"{module.capitalize()}Base"
-        
-        pydantic_models[model_name] = f'''class {model_name}(BaseModel):
-    """Base model for {module}"""
-    name: str
-    description: Optional[str] = None'''
-        
-        json_schemas[model_name] = {
+        # The same module recurs across many cached combinations; interned
+        # names and descriptions are stored once however often it appears
+        model_name = sys.intern(module.capitalize() + "Base")
+        source = _MODULE_MODEL_SOURCE.format(model_name=model_name, module=module)
+        schema = {
             "type": "object",
             "title": model_name,
-            "description": f"Base model for {module}",
-            "properties": {
-                "name": {"type": "string"},
-                "description": {"type": "string", "nullable": True}
-            },
-            "required": ["name"]
+            "description": sys.intern("Base model for " + module),
+            "properties": _MODULE_PROPERTIES,
+            "required": _MODULE_REQUIRED,
         }
+        pydantic_models[model_name] = source
+        json_schemas[model_name] = schema
+        field_counts[model_name] = _MODULE_FIELD_COUNT
+        model_members[model_name] = _member(model_name, source)
+        schema_members[model_name] = _member(model_name, schema)
     
     return SchemaVisualization(
         pydantic_models=pydantic_models,
         json_schemas=json_schemas,
+        field_counts=field_counts,
+        pydantic_models_json=_join_members(model_members),
+        json_schemas_json=_join_members(schema_members),
     )
 
 
@@ -222,16 +335,66 @@ def generate_json_schema(cps_data: Dict[str, Any]) -> Dict[str, Any]:
     Returns:
         JSON Schema document
     """
-    visualization = extract_schemas_from_cps(cps_data)
+    return generate_json_schema_from_visualization(extract_schemas_from_cps(cps_data), cps_data)
+
+
+def generate_json_schema_from_visualization(
+    visualization: SchemaVisualization, cps_data: Dict[str, Any]
+) -> Dict[str, Any]:
+    """
+    Build the JSON Schema document from an already extracted visualization.
+    
+    Args:
+        visualization: Result of extract_schemas_from_cps for cps_data
+        cps_data: CPS model as dictionary
+        
+    Returns:
+        JSON Schema document
+    """
+    return {
+        **_json_schema_header(cps_data),
+        "definitions": visualization.json_schemas,
+    }
+
+
+def _json_schema_header(cps_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Top-level keys of the JSON Schema document, ahead of its definitions"""
+    project_name = cps_data.get("project_name", "API")
     
     return {
         "$schema": "http://json-schema.org/draft-07/schema#",
-        "title": f"{cps_data.get('project_name', 'API')} Schemas",
-        "description": f"Request/response schemas for {cps_data.get('project_name', 'API')}",
-        "definitions": visualization.json_schemas,
+        "title": f"{project_name} Schemas",
+        "description": f"Request/response schemas for {project_name}",
     }
 
 
+def generate_schemas_payload(cps_data: Dict[str, Any]) -> bytes:
+    """
+    Encode the complete schemas response for CPS as JSON bytes.
+    
+    The body holds pydantic_models, json_schemas and complete_schema, the
+    same as encoding those dicts directly. The models and schemas are
+    encoded once per cached visualization, and the encoded schemas are
+    spliced into both places they appear.
+    
+    Args:
+        cps_data: CPS model as dictionary
+        
+    Returns:
+        UTF-8 JSON document
+    """
+    visualization = extract_schemas_from_cps(cps_data)
+    schemas_json = visualization.json_schemas_json
+    
+    return b"".join((
+        b'{"pydantic_models":', visualization.pydantic_models_json,
+        b',"json_schemas":', schemas_json,
+        b',"complete_schema":', _dumps(_json_schema_header(cps_data))[:-1],
+        b',"definitions":', schemas_json,
+        b"}}",
+    ))
+
+
 def get_schema_summary(cps_data: Dict[str, Any]) -> Dict[str, Any]:
     """
     Get a summary of all schemas that will be generated.
@@ -244,19 +407,23 @@ def get_schema_summary(cps_data: Dict[str, Any]) -> Dict[str, Any]:
     Returns:
         Summary with model names and basic info
     """
-    visualization = extract_schemas_from_cps(cps_data)
+    return get_schema_summary_from_visualization(extract_schemas_from_cps(cps_data))
+
+
+def get_schema_summary_from_visualization(visualization: SchemaVisualization) -> Dict[str, Any]:
+    """
+    Summarize an already extracted visualization.
     
-    summary = {
+    Args:
+        visualization: Result of extract_schemas_from_cps
+        
+    Returns:
+        Summary with model names and basic info
+    """
+    return {
         "total_models": len(visualization.pydantic_models),
-        "models": []
+        "models": [
+            {"name": name, "field_count": field_count}
+            for name, field_count in visualization.field_counts.items()
+        ],
     }
-    
-    for name, code in visualization.pydantic_models.items():
-        # Extract field count from code
-        field_count = code.count(":") - 1  # Approximate
-        summary["models"].append({
-            "name": name,
-            "field_count": max(1, field_count),
-        })
-    
-    return summary
@@ -250,11 +250,11 @@ export default function CPSPreview({ cps, setCps, onGenerate, loading }: CPSPrev
                                     <div className="grid grid-cols-2 gap-4">
                                         <div className="bg-white/5 p-3 rounded">
                                             <div className="text-xs text-white/50">Input Cost / 1k Tokens</div>
-                                            <div className="text-lg font-mono">${costs.costs_usd?.per_chat_request || 0}</div>
+                                            <div className="text-lg font-mono">${Number((costs.costs_usd?.per_chat_request || 0).toFixed(6))}</div>
                                         </div>
                                         <div className="bg-white/5 p-3 rounded">
                                             <div className="text-xs text-white/50">Output Cost / 1k Tokens</div>
-                                            <div className="text-lg font-mono">${costs.costs_usd?.per_rag_query || 0}</div>
+                                            <div className="text-lg font-mono">${Number((costs.costs_usd?.per_rag_query || 0).toFixed(6))}</div>
                                         </div>
                                     </div>
                                     <div className="text-[10px] text-white/30 italic mt-2 border-t border-white/10 pt-2">
@@ -274,7 +274,7 @@ export default function CPSPreview({ cps, setCps, onGenerate, loading }: CPSPrev
                             <div className="flex items-center justify-center h-32 text-white/40 animate-pulse">Generating Spec...</div>
                         ) : openapi ? (
                             <pre className="bg-black/40 p-4 rounded border border-white/10 text-xs font-mono h-full overflow-auto text-blue-400">
-                                {JSON.stringify(openapi.json, null, 2)}
+                                {JSON.stringify(openapi.openapi_spec, null, 2)}
                             </pre>
                         ) : (
                             <div className="text-center text-white/40">No OpenAPI spec generated</div>
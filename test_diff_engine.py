@@ -0,0 +1,125 @@
+import random
+import unittest
+from difflib import unified_diff
+from unittest import mock
+
+from api.diff import diff_engine
+from api.diff.diff_engine import FileStatus, _unified_diff, compute_diff, pairwise_similarity
+
+
+def expected_patch(path, hunk):
+    """Exact text _unified_diff produces for a single-hunk change."""
+    return f"--- a/{path}\n+++ b/{path}\n{hunk}"
+
+
+class UnifiedDiffTest(unittest.TestCase):
+
+    def test_repeated_diffs_are_exact(self):
+        # The native backend reads from the encoded buffers lazily; running
+        # many diffs back to back surfaces any buffer freed too early.
+        # Context lines are digits so git adds no function name to the hunk.
+        for i in range(2000):
+            n = i % 7
+            old = "0\n" * n + "y\n"
+            new = "0\n" * n + "z\n"
+            context = "0\n" * min(n, 3)
+            start = n - min(n, 3) + 1
+            count = min(n, 3) + 1
+            header = f"@@ -{start},{count} +{start},{count} @@\n"
+            if count == 1:
+                header = f"@@ -{start} +{start} @@\n"
+            hunk = header + context.replace("0", " 0") + "-y\n+z\n"
+
+            text, additions, deletions = _unified_diff(f"f{n}.py", old, new)
+
+            self.assertEqual(text, expected_patch(f"f{n}.py", hunk))
+            self.assertEqual((additions, deletions), (1, 1))
+
+    def test_backends_share_one_format(self):
+        cases = [
+            ("a\nb\n", "a\nc\n", "@@ -1,2 +1,2 @@\n a\n-b\n+c\n"),
+            ("a\nb", "a\nc", "@@ -1,2 +1,2 @@\n a\n-b\n\\ No newline at end of file\n+c\n\\ No newline at end of file\n"),
+            ("a\nb\n", "a\nb", "@@ -1,2 +1,2 @@\n a\n-b\n+b\n\\ No newline at end of file\n"),
+        ]
+        for old, new, hunk in cases:
+            native = _unified_diff("f.py", old, new)
+            with mock.patch.object(diff_engine, "pygit2", None):
+                fallback = _unified_diff("f.py", old, new)
+            self.assertEqual(fallback[0], expected_patch("f.py", hunk))
+            self.assertEqual(native, fallback)
+
+    def test_counts_match_difflib(self):
+        rnd = random.Random(0)
+        for case in range(300):
+            old = [f"line {i}\n" for i in range(rnd.randint(0, 40))]
+            new = list(old)
+            for edit in range(rnd.randint(1, 5)):
+                op = rnd.choice("adc")
+                if op == "a" or not new:
+                    new.insert(rnd.randint(0, len(new)), f"new {case} {edit}\n")
+                elif op == "d":
+                    del new[rnd.randrange(len(new))]
+                else:
+                    new[rnd.randrange(len(new))] = f"changed {case} {edit}\n"
+
+            reference = list(unified_diff(old, new))
+            expected = (
+                sum(1 for line in reference if line[:1] == "+" and line[:3] != "+++"),
+                sum(1 for line in reference if line[:1] == "-" and line[:3] != "---"),
+            )
+
+            result = compute_diff({"f.py": "".join(old)}, {"f.py": "".join(new)})
+            diff = result.files[0]
+            if expected == (0, 0):
+                self.assertEqual(diff.status, FileStatus.UNCHANGED)
+                continue
+            self.assertEqual(diff.status, FileStatus.MODIFIED)
+            self.assertEqual((diff.additions, diff.deletions), expected)
+
+    def test_hashes_carry_over_regeneration_cycles(self):
+        v1 = {"a.py": "a = 1\n", "b.py": "b = 1\n"}
+        v2 = {"a.py": "a = 1\n", "b.py": "b = 2\n"}
+
+        self.assertEqual(compute_diff({}, v1).hashes, {})
+        first = compute_diff({}, v1, with_hashes=True)
+        self.assertEqual(set(first.hashes), {"a.py", "b.py"})
+        self.assertEqual(first.to_dict()["hashes"], first.hashes)
+
+        # Second cycle: old contents are compared by hash, not rehashed
+        with mock.patch.object(diff_engine, "content_hash", wraps=diff_engine.content_hash) as hashed:
+            second = compute_diff(v1, v2, old_hashes=first.hashes)
+        self.assertEqual(hashed.call_count, len(v2))
+        statuses = {f.path: f.status for f in second.files}
+        self.assertEqual(statuses, {"a.py": FileStatus.UNCHANGED, "b.py": FileStatus.MODIFIED})
+        self.assertEqual(second.hashes["a.py"], first.hashes["a.py"])
+        self.assertNotEqual(second.hashes["b.py"], first.hashes["b.py"])
+
+    def test_empty_added_and_removed_files(self):
+        result = compute_diff({"gone.py": ""}, {"new.py": ""})
+        diffs = {f.path: f for f in result.files}
+        self.assertEqual(diffs["new.py"].diff_lines, "--- /dev/null\n+++ b/new.py\n@@ -0,0 +0,0 @@\n")
+        self.assertEqual(diffs["gone.py"].diff_lines, "--- a/gone.py\n+++ /dev/null\n@@ -0,0 +0,0 @@\n")
+        self.assertEqual((diffs["new.py"].additions, diffs["gone.py"].deletions), (0, 0))
+
+        result = compute_diff({"gone.py": "a\nb"}, {"new.py": "a\nb"})
+        diffs = {f.path: f for f in result.files}
+        self.assertEqual(diffs["new.py"].diff_lines, "--- /dev/null\n+++ b/new.py\n@@ -0,0 +1,2 @@\n+a\n+b\n")
+        self.assertEqual(diffs["gone.py"].diff_lines, "--- a/gone.py\n+++ /dev/null\n@@ -1,2 +0,0 @@\n-a\n-b\n")
+
+
+class PairwiseSimilarityTest(unittest.TestCase):
+
+    @unittest.skipIf(diff_engine.cdist is None, "rapidfuzz cdist not installed")
+    def test_fallback_matches_cdist(self):
+        # Pairs far below SIMILARITY_THRESHOLD must not get the length bound
+        versions = [{"a.py": "x" * 100}, {"a.py": "y" * 10}, {"a.py": "y" * 50 + "x" * 5}, {}]
+        expected = pairwise_similarity(versions)
+        with mock.patch.object(diff_engine, "cdist", None):
+            actual = pairwise_similarity(versions)
+        for row, expected_row in zip(actual, expected):
+            for value, expected_value in zip(row, expected_row):
+                self.assertAlmostEqual(value, expected_value)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,10 +1,20 @@
-import requests
+import asyncio
+import importlib.util
+import httpx
 import json
 import sys
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 BASE_URL = "http://127.0.0.1:8001"
 API_KEY = "fastapi-gen-secret"
 
+# httpx only negotiates HTTP/2 with the optional h2 package installed
+HTTP2 = importlib.util.find_spec("h2") is not None
+
 # Test Data
 CPS = {
     "project_name": "TestProject",
@@ -35,54 +45,68 @@ CPS = {
     }
 }
 
-def test_endpoint(name, method, endpoint, data=None):
-    print(f"Testing {name} ({endpoint})...", end=" ")
-    url = f"{BASE_URL}{endpoint}"
-    headers = {"X-Api-Key": API_KEY}
+async def run_probe(client, name, method, endpoint, data=None):
+    """Call one endpoint; returns (report text, parsed JSON or None)"""
+    label = f"Testing {name} ({endpoint})..."
     
     try:
         if method == "GET":
-            response = requests.get(url, headers=headers)
+            response = await client.get(endpoint)
+        elif orjson is not None:
+            response = await client.post(
+                endpoint, content=orjson.dumps(data), headers={"Content-Type": "application/json"}
+            )
         else:
-            response = requests.post(url, json=data, headers=headers)
+            response = await client.post(endpoint, json=data)
             
         if response.status_code == 200:
-            print("âœ… OK")
-            return response.json()
+            return f"{label} âœ… OK", response.json()
         else:
-            print(f"âŒ FAILED ({response.status_code})")
-            print(response.text)
-            return None
+            return f"{label} âŒ FAILED ({response.status_code})\n{response.text}", None
     except Exception as e:
-        print(f"âŒ ERROR: {e}")
-        return None
+        return f"{label} âŒ ERROR: {e}", None
 
-def main():
+async def test_endpoint(client, name, method, endpoint, data=None):
+    report, result = await run_probe(client, name, method, endpoint, data)
+    print(report)
+    return result
+
+async def run_all():
     print(f"Running tests against {BASE_URL}\n")
     
-    # 1. Health
-    test_endpoint("Health Check", "GET", "/api/health")
-    
-    # 2. Providers (Feature #4)
-    test_endpoint("List Providers", "GET", "/api/providers")
-    
-    # 3. Prompts (Feature #5)
-    test_endpoint("List Prompts", "GET", "/api/prompts")
-    
-    # 4. OpenAPI Preview (Feature #1)
-    test_endpoint("OpenAPI Preview", "POST", "/api/openapi-preview", CPS)
-    
-    # 5. Cost Estimation (Feature #2)
-    test_endpoint("Cost Estimation", "POST", "/api/estimate-costs", CPS)
-    
-    # 6. Schemas (Feature #6)
-    test_endpoint("Schema Visualization", "POST", "/api/schemas", CPS)
-    
-    # 7. Pre-flight Check (Feature #7)
-    test_endpoint("Pre-flight Validation", "POST", "/api/preflight", {"cps": CPS})
+    # One client (and connection pool) for every probe; no timeout, since
+    # generation can take a while
+    async with httpx.AsyncClient(
+        base_url=BASE_URL, headers={"X-Api-Key": API_KEY}, http2=HTTP2, timeout=None
+    ) as client:
+        await run_probes(client)
+
+    print("\nTests completed.")
+
+async def run_probes(client):
+    # Steps 1-7 are independent, so they run concurrently; reports are
+    # printed in step order
+    probes = [
+        # 1. Health
+        ("Health Check", "GET", "/api/health"),
+        # 2. Providers (Feature #4)
+        ("List Providers", "GET", "/api/providers"),
+        # 3. Prompts (Feature #5)
+        ("List Prompts", "GET", "/api/prompts"),
+        # 4. OpenAPI Preview (Feature #1)
+        ("OpenAPI Preview", "POST", "/api/openapi-preview", CPS),
+        # 5. Cost Estimation (Feature #2)
+        ("Cost Estimation", "POST", "/api/estimate-costs", CPS),
+        # 6. Schemas (Feature #6)
+        ("Schema Visualization", "POST", "/api/schemas", CPS),
+        # 7. Pre-flight Check (Feature #7)
+        ("Pre-flight Validation", "POST", "/api/preflight", {"cps": CPS}),
+    ]
+    for report, _ in await asyncio.gather(*(run_probe(client, *probe) for probe in probes)):
+        print(report)
     
     # 8. Generation (Features #3, #8, #9, #11)
-    gen_result = test_endpoint("Code Generation", "POST", "/api/generate", CPS)
+    gen_result = await test_endpoint(client, "Code Generation", "POST", "/api/generate", CPS)
     
     if gen_result and "files" in gen_result:
         files = gen_result["files"]
@@ -104,17 +128,15 @@ def main():
                 print(f"   âŒ Missing {f}")
         
         # 9. Diff (Feature #10)
-        # Create 'old' files which are slightly different
-        old_files = files.copy()
-        if "TestProject/Dockerfile" in old_files:
-            old_files["TestProject/Dockerfile"] = "# Old content"
-            
-        test_endpoint("Diff Computation", "POST", "/api/diff", {
-            "old_files": old_files,
-            "new_files": files
+        # Only the changed file is sent; unchanged files add nothing to the diff
+        dockerfile = "TestProject/Dockerfile"
+        await test_endpoint(client, "Diff Computation", "POST", "/api/diff", {
+            "old_files": {dockerfile: "# Old content"},
+            "new_files": {dockerfile: files.get(dockerfile, "")}
         })
 
-    print("\nTests completed.")
+def main():
+    asyncio.run(run_all())
 
 if __name__ == "__main__":
     main()